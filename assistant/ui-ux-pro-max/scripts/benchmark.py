@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - performance suite for the BM25 search engine
+Usage: python benchmark.py [--scales 10000 100000 1000000] [--synthetic-sources style stack:react]
+                           [--engine] [--queries 200] [--output results.json]
+
+For every CSV_CONFIG domain and STACK_CONFIG stack it times the index build,
+compiled-index load, single-query latency and batch throughput, and records
+the build's peak traced memory and compiled index size. The same is repeated
+on synthetic CSVs generated from a source's schema at each --scale. --engine
+adds the algorithm comparisons (inverted index vs. full scan, top_k() vs. full
+sort, score_batch() vs. per-query scoring). Results are printed as JSON.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+from core import (
+    CSV_CONFIG, STACK_CONFIG, AVAILABLE_STACKS, DATA_DIR, MAX_RESULTS, BM25,
+    _STACK_COLS, _build_index, _write_index, _read_index, _index_from_payload,
+    _vectorized_backend, INDEX_VERSION
+)
+
+
+def _load_csv(filepath):
+    """Load CSV and return list of dicts"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def _vocabulary():
+    """Collect (tokens, document lengths) from every bundled domain CSV"""
+    tokenizer = BM25()
+    vocab, lengths = [], []
+    for config in CSV_CONFIG.values():
+        for row in _load_csv(DATA_DIR / config["file"]):
+            tokens = tokenizer.tokenize(" ".join(str(row.get(col, "")) for col in config["search_cols"]))
+            vocab.extend(tokens)
+            lengths.append(max(len(tokens), 1))
+    return vocab, lengths
+
+
+def synthetic_corpus(size, seed=0):
+    """Generate `size` documents whose term and length distributions follow the bundled data"""
+    rng = random.Random(seed)
+    vocab, lengths = _vocabulary()
+    return [" ".join(rng.choices(vocab, k=rng.choice(lengths))) for _ in range(size)]
+
+
+def synthetic_queries(count, seed=1):
+    """Generate short 1-3 term queries drawn from the bundled vocabulary"""
+    rng = random.Random(seed)
+    vocab, _ = _vocabulary()
+    return [" ".join(rng.choices(vocab, k=rng.randint(1, 3))) for _ in range(count)]
+
+
+def scan_score(bm25, corpus, query):
+    """Reference full-scan scorer (the pre-inverted-index algorithm)"""
+    query_tokens = bm25.tokenize(query)
+    scores = []
+    for idx, doc in enumerate(corpus):
+        score = 0
+        doc_len = bm25.doc_lengths[idx]
+        term_freqs = defaultdict(int)
+        for word in doc:
+            term_freqs[word] += 1
+        for token in query_tokens:
+            if token in bm25.vocab:
+                tf = term_freqs[token]
+                numerator = tf * (bm25.k1 + 1)
+                denominator = tf + bm25.k1 * (1 - bm25.b + bm25.b * doc_len / bm25.avgdl)
+                score += bm25.term_idf(token) * numerator / denominator
+        scores.append((idx, score))
+    return sorted(scores, key=lambda x: x[1], reverse=True)
+
+
+def _mean_ms(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def bench_query_latency(sizes, num_queries):
+    """Mean per-query latency (ms) of inverted-index vs. full-scan scoring per corpus size"""
+    queries = synthetic_queries(num_queries)
+    rows = []
+    for size in sizes:
+        documents = synthetic_corpus(size)
+        bm25 = BM25()
+        bm25.fit(documents)
+        corpus = [bm25.tokenize(doc) for doc in documents]
+        # the scan is O(corpus tokens); cap its sample so large sizes finish
+        scan_queries = queries[:max(1, min(len(queries), 200000 // size))]
+        rows.append({
+            "size": size,
+            "inverted_ms": _mean_ms(bm25.score, queries),
+            "scan_ms": _mean_ms(lambda q: scan_score(bm25, corpus, q), scan_queries)
+        })
+    return rows
+
+
+def bench_top_k(sizes, num_queries, k=3):
+    """Mean per-query latency (ms) of heap/MaxScore top_k() vs. fully sorted score_tokens()"""
+    queries = synthetic_queries(num_queries)
+    rows = []
+    for size in sizes:
+        bm25 = BM25()
+        bm25.fit(synthetic_corpus(size))
+        tokenized = [bm25.tokenize(q) for q in queries]
+        rows.append({
+            "size": size,
+            "top_k_ms": _mean_ms(lambda t: bm25.top_k(t, k), tokenized),
+            "full_sort_ms": _mean_ms(lambda t: bm25.score_tokens(t)[:k], tokenized)
+        })
+    return rows
+
+
+def bench_batch_scoring(sizes, num_queries, top_k=3):
+    """Throughput (queries/s) of score_batch() vs. one score() call per query"""
+    queries = synthetic_queries(num_queries)
+    rows = []
+    for size in sizes:
+        bm25 = BM25()
+        bm25.fit(synthetic_corpus(size))
+        bm25.score_batch(queries[:1], top_k)  # build the sparse matrix outside the timing
+
+        start = time.perf_counter()
+        bm25.score_batch(queries, top_k)
+        batch_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for q in queries:
+            bm25.score(q)[:top_k]
+        single_s = time.perf_counter() - start
+
+        rows.append({
+            "size": size,
+            "batch_qps": num_queries / batch_s,
+            "single_qps": num_queries / single_s
+        })
+    return rows
+
+
+def _sources(names=None):
+    """(name, path, search_cols, output_cols) for bundled domains and stacks ("stack:<name>")"""
+    sources = [(domain, DATA_DIR / config["file"], config["search_cols"], config["output_cols"])
+               for domain, config in CSV_CONFIG.items()]
+    sources += [(f"stack:{stack}", DATA_DIR / STACK_CONFIG[stack]["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"])
+                for stack in AVAILABLE_STACKS]
+    if names is not None:
+        by_name = {source[0]: source for source in sources}
+        unknown = [name for name in names if name not in by_name]
+        if unknown:
+            raise SystemExit(f"Unknown source(s): {', '.join(unknown)}")
+        sources = [by_name[name] for name in names]
+    return sources
+
+
+def _source_queries(filepath, search_cols, count, seed=2):
+    """1-3 term queries drawn from a source's own search columns, so most of them hit"""
+    rng = random.Random(seed)
+    tokenizer = BM25()
+    vocab = []
+    for row in _load_csv(filepath):
+        vocab.extend(tokenizer.tokenize(" ".join(str(row.get(col, "")) for col in search_cols)))
+    vocab = vocab or ["none"]
+    return [" ".join(rng.choices(vocab, k=rng.randint(1, 3))) for _ in range(count)]
+
+
+def synthetic_csv(filepath, rows, dest, seed=0):
+    """Write `rows` synthetic rows with the schema of `filepath`, sampling each column from its values"""
+    rng = random.Random(seed)
+    data = _load_csv(filepath)
+    fieldnames = list(data[0].keys())
+    columns = {col: [row[col] for row in data] for col in fieldnames}
+    with open(dest, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        for _ in range(rows):
+            writer.writerow([rng.choice(columns[col]) for col in fieldnames])
+    return dest
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def bench_source(name, filepath, search_cols, output_cols, queries, workdir, memory=True):
+    """Build, load, single-query and batch metrics for one source file"""
+    filepath = Path(filepath)
+    start = time.perf_counter()
+    index = _build_index(filepath, search_cols, output_cols)
+    build_s = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        _build_index(filepath, search_cols, output_cols)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    index_path = Path(workdir) / f"{name.replace(':', '-')}.idx"
+    payload = {
+        "version": INDEX_VERSION,
+        "key": (list(search_cols), list(output_cols)),
+        "stamp": None,
+        "sha256": None,
+        "bm25": index.bm25.to_dict(),
+        "columns": index.columns,
+        "rows": index.rows,
+        "offsets": index.lazy.offsets if index.lazy is not None else None
+    }
+    _write_index(index_path, payload)
+    start = time.perf_counter()
+    _index_from_payload(filepath, _read_index(index_path))
+    load_s = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        ranked = index.bm25.top_k(index.bm25.tokenize(query), MAX_RESULTS)
+        [index.row(idx) for idx, _ in ranked]
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    index.bm25.score_batch(queries[:1], MAX_RESULTS)  # build the sparse matrix outside the timing
+    start = time.perf_counter()
+    index.bm25.score_batch(queries, MAX_RESULTS)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "source": name,
+        "rows": index.bm25.N,
+        "terms": len(index.bm25.vocab),
+        "file_bytes": filepath.stat().st_size,
+        "lazy_rows": index.lazy is not None,
+        "build_ms": build_s * 1000,
+        "build_peak_mb": peak_mb,
+        "index_bytes": index_path.stat().st_size if index_path.exists() else None,
+        "load_ms": load_s * 1000,
+        "query_mean_ms": statistics.fmean(latencies),
+        "query_p50_ms": _percentile(latencies, 50),
+        "query_p95_ms": _percentile(latencies, 95),
+        "batch_qps": len(queries) / batch_s if batch_s else None
+    }
+
+
+def bench_bundled(num_queries, workdir, names=None, memory=True):
+    """bench_source() for every bundled domain and stack"""
+    results = []
+    for name, filepath, search_cols, output_cols in _sources(names):
+        if not filepath.exists():
+            continue
+        print(f"[bench] {name}", file=sys.stderr)
+        queries = _source_queries(filepath, search_cols, num_queries)
+        results.append(bench_source(name, filepath, search_cols, output_cols, queries, workdir, memory))
+    return results
+
+
+def bench_synthetic(scales, names, num_queries, workdir, memory=True):
+    """bench_source() on synthetic CSVs with each source's schema at every scale"""
+    results = []
+    for name, filepath, search_cols, output_cols in _sources(names):
+        queries = _source_queries(filepath, search_cols, num_queries)
+        for scale in scales:
+            print(f"[bench] {name} x {scale} rows", file=sys.stderr)
+            dest = synthetic_csv(filepath, scale, Path(workdir) / f"{name.replace(':', '-')}-{scale}.csv")
+            result = bench_source(f"{name}@{scale}", dest, search_cols, output_cols, queries, workdir, memory)
+            result["scale"] = scale
+            results.append(result)
+            os.unlink(dest)
+    return results
+
+
+def bench_engine(sizes, num_queries):
+    """Algorithm comparisons on synthetic token corpora"""
+    return {
+        "query_latency": bench_query_latency(sizes, num_queries),
+        "top_k": bench_top_k(sizes, num_queries),
+        "batch_scoring": bench_batch_scoring(sizes, num_queries)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max BM25 Benchmark")
+    parser.add_argument("--sources", nargs="+", help="Bundled sources to benchmark (default: every domain and stack:<name>)")
+    parser.add_argument("--scales", type=int, nargs="*", default=[10000, 100000, 1000000], help="Synthetic row counts (default: 10000 100000 1000000)")
+    parser.add_argument("--synthetic-sources", nargs="+", default=["style"], help="Schemas to scale synthetically (default: style)")
+    parser.add_argument("--engine", action="store_true", help="Also run the algorithm comparisons")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Corpus sizes for --engine")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per measurement (default: 200)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced-memory rebuild (halves build time)")
+    parser.add_argument("--output", "-o", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ui-ux-pro-max-bench-") as workdir:
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "vectorized": _vectorized_backend() is not None,
+            "max_results": MAX_RESULTS,
+            "queries": args.queries,
+            "bundled": bench_bundled(args.queries, workdir, args.sources, not args.no_memory),
+            "synthetic": bench_synthetic(args.scales, args.synthetic_sources, args.queries, workdir, not args.no_memory)
+        }
+        if args.engine:
+            report["engine"] = bench_engine(args.sizes, args.queries)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Client - thin JSON-RPC client for server.py
+Connects to the per-user search daemon, spawning it on first use. When Unix
+sockets are unavailable or the daemon cannot start, searches run in-process.
+"""
+
+import itertools
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from protocol import check_socket, default_socket_path
+
+SERVER_SCRIPT = Path(__file__).parent / "server.py"
+SPAWN_TIMEOUT = 10.0
+
+
+class DaemonUnavailable(Exception):
+    """The search daemon could not be reached or started"""
+
+
+class SearchClient:
+    """Persistent connection to the search daemon"""
+
+    def __init__(self, path=None, spawn=True, timeout=SPAWN_TIMEOUT):
+        self.path = path or default_socket_path()
+        self.spawn = spawn
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+        self._ids = itertools.count(1)
+
+    def _try_connect(self):
+        try:
+            check_socket(self.path)
+        except FileNotFoundError:
+            return False
+        except PermissionError as e:
+            # someone else's socket could feed made-up results to the caller
+            raise DaemonUnavailable(str(e))
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            return False
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+        return True
+
+    def _spawn_server(self):
+        subprocess.Popen(
+            [sys.executable, str(SERVER_SCRIPT), "--socket", self.path],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True, close_fds=True
+        )
+
+    def connect(self):
+        """Connect to the daemon, starting it if needed"""
+        if self._sock is not None:
+            return
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailable("Unix sockets are not available on this platform")
+        if self._try_connect():
+            return
+        if not self.spawn:
+            raise DaemonUnavailable(f"No search daemon listening on {self.path}")
+
+        self._spawn_server()
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self._try_connect():
+                return
+            time.sleep(0.02)
+        raise DaemonUnavailable(f"Search daemon did not start on {self.path}")
+
+    def close(self):
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = self._file = None
+
+    def call(self, method, **params):
+        """Send one JSON-RPC request and return its result"""
+        self.connect()
+        request = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        try:
+            self._file.write((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+            self._file.flush()
+            line = self._file.readline()
+        except OSError as e:
+            self.close()
+            raise DaemonUnavailable(f"Lost connection to search daemon: {e}")
+        if not line:
+            self.close()
+            raise DaemonUnavailable("Search daemon closed the connection")
+
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(response["error"]["message"])
+        return response["result"]
+
+    def search(self, query, domain=None, max_results=None, route=False):
+        params = {"query": query, "domain": domain, "route": route}
+        if max_results is not None:
+            params["max_results"] = max_results
+        return self.call("search", **params)
+
+    def search_stack(self, query, stack, max_results=None):
+        params = {"query": query, "stack": stack}
+        if max_results is not None:
+            params["max_results"] = max_results
+        return self.call("search_stack", **params)
+
+    def search_all(self, query, stack=None, max_results=None):
+        params = {"query": query, "stack": stack}
+        if max_results is not None:
+            params["max_results"] = max_results
+        return self.call("search_all", **params)
+
+
+_client = None
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = SearchClient()
+    return _client
+
+
+def search(query, domain=None, max_results=None, route=False):
+    """core.search() through the daemon, falling back to an in-process search"""
+    try:
+        return _get_client().search(query, domain, max_results, route)
+    except DaemonUnavailable:
+        import core
+        return core.search(query, domain, core.MAX_RESULTS if max_results is None else max_results, route)
+
+
+def search_stack(query, stack, max_results=None):
+    """core.search_stack() through the daemon, falling back to an in-process search"""
+    try:
+        return _get_client().search_stack(query, stack, max_results)
+    except DaemonUnavailable:
+        import core
+        return core.search_stack(query, stack, core.MAX_RESULTS if max_results is None else max_results)
+
+
+def search_all(query, stack=None, max_results=None):
+    """core.search_all() through the daemon, falling back to an in-process search"""
+    try:
+        return _get_client().search_all(query, stack, max_results)
+    except DaemonUnavailable:
+        import core
+        return core.search_all(query, stack, core.MAX_RESULTS if max_results is None else max_results)
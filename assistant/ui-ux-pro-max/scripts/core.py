@@ -4,15 +4,34 @@
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
-import csv
+import heapq
+import os
+import pickle
 import re
+import threading
+import time
+from array import array
 from pathlib import Path
+from bisect import bisect_left
 from math import log
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+
+# csv, hashlib, json and tempfile are imported where used: a search served from
+# a compiled index needs none of them, and startup dominates one-shot CLI calls.
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_DIR = Path(__file__).parent.parent / ".index"
+INDEX_VERSION = 5
 MAX_RESULTS = 3
+# Sources larger than this (and all JSONL sources) read output rows back from disk on demand
+LAZY_ROWS_BYTES = 8 * 1024 * 1024
+# Query results kept per process by QUERY_CACHE (0 disables it)
+QUERY_CACHE_SIZE = 256
+try:
+    QUERY_CACHE_SIZE = int(os.environ.get("UI_UX_PRO_MAX_QUERY_CACHE", QUERY_CACHE_SIZE))
+except ValueError:
+    pass  # not a number: keep the default
 
 CSV_CONFIG = {
     "style": {
@@ -81,98 +100,777 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
 # ============ BM25 IMPLEMENTATION ============
+_PUNCTUATION = re.compile(r'[^\w\s]')
+# Query terms missing from an index are expanded to index terms they prefix (from
+# FUZZY_PREFIX_MIN characters) or are within 1 edit of (2 edits from FUZZY_TWO_EDITS
+# characters). The best FUZZY_MAX_EXPANSIONS share a weight of FUZZY_WEIGHT ** edits,
+# a prefix completion counting as one edit, so they always rank below exact terms.
+FUZZY_SEARCH = True  # used by search(), search_stack(), search_all() and route_domains()
+FUZZY_PREFIX_MIN = 5
+FUZZY_ONE_EDIT = 6
+FUZZY_TWO_EDITS = 9
+FUZZY_MAX_EXPANSIONS = 3
+FUZZY_WEIGHT = 0.5
+
+
+def _after_prefix(prefix):
+    """Smallest string sorting after every string that starts with `prefix`"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _fuzzy_terms(terms, token, max_edits):
+    """(term, edits) for each term of the sorted `terms` within `max_edits` of `token`.
+
+    Walks the sorted array as a trie: Levenshtein rows are shared along common
+    prefixes, and once every cell of a row exceeds `max_edits` the whole block of
+    terms under that prefix is skipped with one bisect.
+    """
+    matches = []
+    n = len(token)
+    big = max_edits + 1  # every distance above max_edits is stored as `big`
+    rows = [[min(c, big) for c in range(n + 1)]]  # rows[j]: distances after the first j characters of `prev`
+    prev = ""
+    i = 0
+    while i < len(terms):
+        word = terms[i]
+        common = 0
+        limit = min(len(prev), len(word), len(rows) - 1)
+        while common < limit and prev[common] == word[common]:
+            common += 1
+        del rows[common + 1:]
+        for j in range(common, len(word)):
+            above = rows[-1]
+            ch = word[j]
+            # only the diagonal band |c - (j + 1)| <= max_edits can stay within reach
+            row = [big] * (n + 1)
+            row[0] = best = min(j + 1, big)
+            for c in range(max(1, j + 1 - max_edits), min(n, j + 1 + max_edits) + 1):
+                d = above[c - 1] + (token[c - 1] != ch)
+                if above[c] < d:
+                    d = above[c] + 1
+                if row[c - 1] < d:
+                    d = row[c - 1] + 1
+                if d < best:
+                    best = d
+                row[c] = d if d < big else big
+            rows.append(row)
+            if best > max_edits:
+                prev = word[:j + 1]
+                i = bisect_left(terms, _after_prefix(prev), i + 1)
+                break
+        else:
+            if rows[-1][n] <= max_edits:
+                matches.append((word, rows[-1][n]))
+            prev = word
+            i += 1
+    return matches
+
+
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search, backed by an inverted index.
+
+    Terms are mapped to integer ids in `vocab`; postings[id] is a pair of
+    compact arrays (document ids, term frequencies) in ascending document order.
+    `terms` is the vocabulary sorted, for prefix and fuzzy expansion.
+    """
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
-        self.doc_lengths = []
+        self.vocab = {}
+        self.terms = []
+        self.postings = []
+        self.doc_lengths = array('I')
+        self.doc_norms = []
         self.avgdl = 0
-        self.idf = {}
-        self.doc_freqs = defaultdict(int)
+        self.idf = array('d')
+        self.max_weights = array('d')
         self.N = 0
+        self._matrix = None
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+        text = _PUNCTUATION.sub(' ', str(text).lower())
         return [w for w in text.split() if len(w) > 2]
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
-        if self.N == 0:
-            return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
-
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
+        """Build BM25 index from an iterable of documents, consumed in a single pass"""
+        vocab, postings = {}, []
+        doc_lengths = array('I')
+        for idx, doc in enumerate(documents):
+            tokens = self.tokenize(doc)
+            doc_lengths.append(len(tokens))
             term_freqs = defaultdict(int)
-            for word in doc:
+            for word in tokens:
                 term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                term_id = vocab.get(word)
+                if term_id is None:
+                    term_id = vocab[word] = len(postings)
+                    postings.append((array('I'), array('I')))
+                docs, tfs = postings[term_id]
+                docs.append(idx)
+                tfs.append(tf)
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+        self.vocab = vocab
+        self.terms = sorted(vocab)
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.N = len(doc_lengths)
+        if self.N == 0:
+            return
+        self.avgdl = sum(doc_lengths) / self.N
+        self._prepare()
 
-            scores.append((idx, score))
+    def _prepare(self, max_weights=None):
+        """Derive idf, length norms and per-term score bounds from the postings"""
+        N = self.N
+        self.idf = array('d', (log((N - len(docs) + 0.5) / (len(docs) + 0.5) + 1) for docs, _ in self.postings))
+        self.doc_norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+        if max_weights is None:
+            k1_plus = self.k1 + 1
+            norms = self.doc_norms
+            max_weights = array('d', (
+                idf * max((tf * k1_plus) / (tf + norms[idx]) for idx, tf in zip(docs, tfs))
+                for idf, (docs, tfs) in zip(self.idf, self.postings)
+            ))
+        self.max_weights = max_weights
+        self._matrix = None
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    def expand(self, token):
+        """(term_id, weight) pairs standing in for a token missing from the vocabulary.
 
+        Costs a bisect plus the matching block for prefix completions, and a
+        pruned walk of the sorted terms for edits, never a vocabulary scan.
+        """
+        terms = self.terms
+        candidates = {}
+        if len(token) >= FUZZY_PREFIX_MIN:
+            lo = bisect_left(terms, token)
+            for term in terms[lo:bisect_left(terms, _after_prefix(token), lo)]:
+                candidates[term] = 1
+        max_edits = 2 if len(token) >= FUZZY_TWO_EDITS else 1 if len(token) >= FUZZY_ONE_EDIT else 0
+        if max_edits:
+            for term, edits in _fuzzy_terms(terms, token, max_edits):
+                candidates[term] = min(edits, candidates.get(term, edits))
 
-# ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+        # closest first, then the most common, then alphabetical
+        best = sorted(candidates, key=lambda t: (candidates[t], -len(self.postings[self.vocab[t]][0]), t))
+        best = best[:FUZZY_MAX_EXPANSIONS]
+        return [(self.vocab[t], FUZZY_WEIGHT ** candidates[t] / len(best)) for t in best]
 
+    def query_terms(self, query_tokens, fuzzy=False):
+        """(term_id, weight) pairs in query order: exact terms weigh 1, expanded ones less"""
+        query_terms = []
+        for token in query_tokens:
+            term_id = self.vocab.get(token)
+            if term_id is not None:
+                query_terms.append((term_id, 1))
+            elif fuzzy:
+                query_terms.extend(self.expand(token))
+        return query_terms
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+    def score(self, query, fuzzy=False):
+        """Score all documents against query, best first (ties keep document order)"""
+        return self.score_tokens(self.tokenize(query), fuzzy)
+
+    def score_tokens(self, query_tokens, fuzzy=False):
+        """score() for an already tokenized query, so callers can tokenize once"""
+        scores = {}
+        k1_plus = self.k1 + 1
+        norms = self.doc_norms
+        for term_id, weight in self.query_terms(query_tokens, fuzzy):
+            idf = self.idf[term_id]
+            docs, tfs = self.postings[term_id]
+            for idx, tf in zip(docs, tfs):
+                scores[idx] = scores.get(idx, 0) + weight * (idf * (tf * k1_plus) / (tf + norms[idx]))
+
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        ranked.extend((idx, 0) for idx in range(self.N) if idx not in scores)
+        return ranked
+
+    def top_k(self, query_tokens, k, fuzzy=False):
+        """Best k documents with a positive score, equal to the head of score_tokens().
+
+        Walks the postings document-at-a-time with a bounded heap (MaxScore):
+        terms whose summed upper bounds cannot beat the current k-th score
+        stop generating candidates and are only probed for documents that
+        the remaining terms put in contention.
+        """
+        if k <= 0:
+            return []
+        k1_plus = self.k1 + 1
+        norms = self.doc_norms
+
+        query_terms = self.query_terms(query_tokens, fuzzy)
+        counts = {}  # summed query weight per term
+        for term_id, weight in query_terms:
+            counts[term_id] = counts.get(term_id, 0) + weight
+        # cheapest terms first
+        terms = sorted(counts, key=lambda t: counts[t] * self.max_weights[t])
+        bounds = [counts[t] * self.max_weights[t] for t in terms]
+        prefix = [0.0]
+        for bound in bounds:
+            prefix.append(prefix[-1] + bound)
+
+        doc_lists = [self.postings[t][0] for t in terms]
+        tf_lists = [self.postings[t][1] for t in terms]
+        idfs = [self.idf[t] for t in terms]
+        cursors = [0] * len(terms)
+
+        heap = []  # (score, -idx): heap[0] is the current k-th best
+        threshold = 0.0
+        first_essential = 0
+        while True:
+            # the next candidate is the smallest current document among essential terms
+            doc = None
+            for i in range(first_essential, len(terms)):
+                if cursors[i] < len(doc_lists[i]):
+                    d = doc_lists[i][cursors[i]]
+                    if doc is None or d < doc:
+                        doc = d
+            if doc is None:
+                break
+
+            weights = {}
+            upper = prefix[first_essential]
+            for i in range(first_essential, len(terms)):
+                pos = cursors[i]
+                if pos < len(doc_lists[i]) and doc_lists[i][pos] == doc:
+                    tf = tf_lists[i][pos]
+                    w = idfs[i] * (tf * k1_plus) / (tf + norms[doc])
+                    weights[terms[i]] = w
+                    upper += counts[terms[i]] * w
+                    cursors[i] = pos + 1
+
+            # probe non-essential terms, most valuable first, while the doc can still qualify
+            for i in range(first_essential - 1, -1, -1):
+                if len(heap) == k and upper * _BOUND_SLACK <= threshold:
+                    break
+                upper -= bounds[i]
+                pos = bisect_left(doc_lists[i], doc, cursors[i])
+                cursors[i] = pos
+                if pos < len(doc_lists[i]) and doc_lists[i][pos] == doc:
+                    tf = tf_lists[i][pos]
+                    w = idfs[i] * (tf * k1_plus) / (tf + norms[doc])
+                    weights[terms[i]] = w
+                    upper += counts[terms[i]] * w
+            else:
+                # same summation order as score_tokens(), so scores and ties match exactly
+                score = 0
+                for term_id, weight in query_terms:
+                    if term_id in weights:
+                        score += weight * weights[term_id]
+                if len(heap) < k:
+                    heapq.heappush(heap, (score, -doc))
+                elif (score, -doc) > heap[0]:
+                    heapq.heapreplace(heap, (score, -doc))
+                else:
+                    continue
+                if len(heap) == k:
+                    threshold = heap[0][0]
+                    while first_essential < len(terms) and prefix[first_essential + 1] * _BOUND_SLACK <= threshold:
+                        first_essential += 1
+
+        return [(-neg_idx, score) for score, neg_idx in sorted(heap, key=lambda x: (-x[0], -x[1]))]
+
+    def term_idf(self, token, default=None):
+        """idf of a term, or `default` when it does not occur in the corpus"""
+        term_id = self.vocab.get(token)
+        return default if term_id is None else self.idf[term_id]
+
+    def max_score(self, query_tokens):
+        """Upper bound of any document's score for these tokens (tf -> infinity).
+
+        Terms missing from the index count at the idf of an unseen term, so an
+        index that cannot match part of the query is normalized down.
+        """
+        unseen_idf = log((self.N + 0.5) / 0.5 + 1)
+        return sum(self.term_idf(token, unseen_idf) for token in query_tokens) * (self.k1 + 1)
+
+    def score_batch(self, queries, top_k=None):
+        """Score many queries at once; entry i equals score(queries[i])[:top_k].
+
+        Uses a sparse term-document weight matrix when NumPy and SciPy are
+        installed, otherwise falls back to calling score() per query.
+        """
+        backend = _vectorized_backend()
+        if backend is None or self.N == 0:
+            return [self.score(q)[:top_k] for q in queries]
+        np, sparse = backend
+
+        weights = self._sparse_weights(np, sparse)
+        rows, cols, counts = [], [], []
+        for qi, query in enumerate(queries):
+            for token in self.tokenize(query):
+                col = self.vocab.get(token)
+                if col is not None:
+                    rows.append(qi)
+                    cols.append(col)
+                    counts.append(1.0)
+        # duplicate (query, term) entries are summed, matching repeated query tokens
+        query_matrix = sparse.csr_matrix((counts, (rows, cols)), shape=(len(queries), len(self.vocab)))
+        scores = (query_matrix @ weights).tocsr()
+        scores.sort_indices()
+
+        k = self.N if top_k is None else min(top_k, self.N)
+        return [self._top_k_row(np, scores, qi, k) for qi in range(len(queries))]
+
+    def _sparse_weights(self, np, sparse):
+        """Build (once) the term x document matrix of precomputed BM25 term weights"""
+        if self._matrix is None:
+            lengths = np.fromiter((len(docs) for docs, _ in self.postings), dtype=np.int64, count=len(self.postings))
+            term_ids = np.repeat(np.arange(len(self.postings), dtype=np.int64), lengths)
+            doc_ids = np.concatenate([np.asarray(docs, dtype=np.int64) for docs, _ in self.postings] or [np.zeros(0, dtype=np.int64)])
+            tfs = np.concatenate([np.asarray(tfs, dtype=np.float64) for _, tfs in self.postings] or [np.zeros(0)])
+            idf = np.asarray(self.idf, dtype=np.float64)
+            norms = np.asarray(self.doc_norms, dtype=np.float64)
+            data = idf[term_ids] * (tfs * (self.k1 + 1)) / (tfs + norms[doc_ids])
+            self._matrix = sparse.csr_matrix((data, (term_ids, doc_ids)), shape=(len(self.postings), self.N))
+        return self._matrix
+
+    def _top_k_row(self, np, scores, qi, k):
+        """Select the k best documents of one result row with argpartition"""
+        start, end = scores.indptr[qi], scores.indptr[qi + 1]
+        docs = scores.indices[start:end]
+        values = scores.data[start:end]
+
+        if len(values) > k:
+            part = np.argpartition(-values, k - 1)[:k]
+            # argpartition is arbitrary among ties at the cut; keep the lowest doc ids like score()
+            threshold = values[part].min()
+            above = np.flatnonzero(values > threshold)
+            ties = np.flatnonzero(values == threshold)[:k - len(above)]
+            keep = np.concatenate([above, ties])
+            docs, values = docs[keep], values[keep]
+
+        order = np.lexsort((docs, -values))
+        ranked = list(zip(docs[order].tolist(), values[order].tolist()))
+        if len(ranked) < k:
+            matched = {idx for idx, _ in ranked}
+            for idx in range(self.N):
+                if len(ranked) >= k:
+                    break
+                if idx not in matched:
+                    ranked.append((idx, 0))
+        return ranked
+
+    def to_dict(self):
+        """Export fitted state as plain data for the on-disk index"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "vocab": self.vocab,
+            "terms": self.terms,
+            "postings": self.postings,
+            "doc_lengths": self.doc_lengths,
+            "avgdl": self.avgdl,
+            "max_weights": self.max_weights,
+            "N": self.N
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Restore a fitted BM25 without re-tokenizing the corpus"""
+        bm25 = cls(state["k1"], state["b"])
+        bm25.vocab = state["vocab"]
+        bm25.terms = state["terms"]
+        bm25.postings = state["postings"]
+        bm25.doc_lengths = state["doc_lengths"]
+        bm25.avgdl = state["avgdl"]
+        bm25.N = state["N"]
+        if bm25.N:
+            bm25._prepare(state["max_weights"])
+        return bm25
+
+
+_VECTORIZED = False
+# Upper bounds are inflated by this factor before pruning so float rounding never drops a real hit
+_BOUND_SLACK = 1 + 1e-9
+
+
+def _vectorized_backend():
+    """Return (numpy, scipy.sparse) when both are installed, else None"""
+    global _VECTORIZED
+    if _VECTORIZED is False:
+        try:
+            import numpy
+            from scipy import sparse
+            _VECTORIZED = (numpy, sparse)
+        except ImportError:
+            _VECTORIZED = None
+    return _VECTORIZED
+
+
+# ============ DATA SOURCES ============
+class _OffsetLines:
+    """Line iterator over a binary file that tracks the byte offset consumed so far"""
+
+    __slots__ = ("f", "offset")
+
+    def __init__(self, f, offset=0):
+        self.f = f
+        self.offset = offset
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.f.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8')
+
+
+def _is_jsonl(filepath):
+    return Path(filepath).suffix.lower() in (".jsonl", ".ndjson")
+
+
+def _iter_records(filepath):
+    """Stream (byte offset, record dict) pairs from a CSV or JSONL file"""
+    import csv
+    import json
+    with open(filepath, 'rb') as f:
+        if _is_jsonl(filepath):
+            offset = 0
+            for line in f:
+                start, offset = offset, offset + len(line)
+                if line.strip():
+                    yield start, json.loads(line)
+            return
+
+        lines = _OffsetLines(f)
+        reader = csv.DictReader(lines)
+        reader.fieldnames  # consume the header row
+        while True:
+            start = lines.offset
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            yield start, row
+
+
+class LazyRows:
+    """Output columns of a large source file, read back by byte offset on demand"""
+
+    __slots__ = ("filepath", "offsets", "output_cols", "_header")
+
+    def __init__(self, filepath, offsets, output_cols):
+        self.filepath = Path(filepath)
+        self.offsets = offsets
+        self.output_cols = output_cols
+        self._header = None
+
+    def fetch(self, idx):
+        """Return output row `idx` as a dict with the columns the record has"""
+        import csv
+        import json
+        with open(self.filepath, 'rb') as f:
+            if _is_jsonl(self.filepath):
+                f.seek(self.offsets[idx])
+                record = json.loads(f.readline())
+            else:
+                if self._header is None:
+                    self._header = next(csv.reader(_OffsetLines(f)))
+                f.seek(self.offsets[idx])
+                # DictReader skips blank lines, so a row's offset may point at blank
+                # lines before the row; skip them
+                values = next(values for values in csv.reader(_OffsetLines(f)) if values)
+                record = dict(zip(self._header, values))
+                record.update((col, None) for col in self._header[len(values):])
+        return {col: record[col] for col in self.output_cols if col in record}
+
+
+# ============ INDEX CACHE ============
+class SearchIndex:
+    """Fitted BM25 plus the output rows of one source file, persisted under INDEX_DIR.
+
+    Small files keep their output rows inline; large ones (see LAZY_ROWS_BYTES)
+    and JSONL files keep only row offsets and read rows back through LazyRows.
+    """
+
+    def __init__(self, bm25, columns, rows, lazy=None):
+        self.bm25 = bm25
+        self.columns = columns
+        self.rows = rows
+        self.lazy = lazy
+        # source stamp this index was loaded for, set by load_index()
+        self.stamp = None
+
+    def row(self, idx):
+        """Return output row `idx` as a dict"""
+        if self.lazy is not None:
+            return self.lazy.fetch(idx)
+        return dict(zip(self.columns, self.rows[idx]))
+
+
+def _index_path(filepath):
+    """Map a CSV under DATA_DIR to its compiled index file under INDEX_DIR"""
+    filepath = Path(filepath)
+    try:
+        rel = filepath.resolve().relative_to(DATA_DIR.resolve())
+    except ValueError:
+        import hashlib
+        rel = Path("_external") / hashlib.sha256(str(filepath.resolve()).encode("utf-8")).hexdigest()[:16] / filepath.name
+    return INDEX_DIR / rel.with_name(rel.name + ".idx")
+
+
+def _file_digest(filepath):
+    """SHA-256 of a file's contents"""
+    import hashlib
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-    data = _load_csv(filepath)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+def _source_stamp(filepath):
+    """Cheap change detector for a source CSV: (mtime_ns, size)"""
+    st = os.stat(filepath)
+    return st.st_mtime_ns, st.st_size
+
+
+def _build_index(filepath, search_cols, output_cols):
+    """Stream the source file once, fitting BM25 over search columns and keeping output columns"""
+    lazy = _is_jsonl(filepath) or _source_stamp(filepath)[1] > LAZY_ROWS_BYTES
+    columns, rows, offsets = [], [], array('Q')
+
+    def documents():
+        for offset, record in _iter_records(filepath):
+            if lazy:
+                offsets.append(offset)
+            else:
+                if not rows:
+                    columns.extend(col for col in output_cols if col in record)
+                rows.append(tuple(record.get(col, "") for col in columns))
+            yield " ".join(str(record.get(col, "")) for col in search_cols)
 
-    # BM25 search
     bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+    bm25.fit(documents())
+    if lazy:
+        return SearchIndex(bm25, list(output_cols), None, LazyRows(filepath, offsets, list(output_cols)))
+    return SearchIndex(bm25, columns, rows)
+
+
+def _write_index(path, payload):
+    """Atomically write an index file; a read-only install just skips caching"""
+    import tempfile
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+
+def _read_index(path):
+    """Load an index file, returning None when missing or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+        return None
+    return payload
+
+
+def _index_from_payload(filepath, payload):
+    lazy = None
+    if payload["offsets"] is not None:
+        lazy = LazyRows(filepath, payload["offsets"], payload["columns"])
+    return SearchIndex(BM25.from_dict(payload["bm25"]), payload["columns"], payload["rows"], lazy)
+
+
+def _load_compiled_index(filepath, search_cols, output_cols, stamp):
+    """Load the compiled index for a source file, rebuilding it if the file changed"""
+    path = _index_path(filepath)
+    key = (list(search_cols), list(output_cols))
+
+    payload = _read_index(path)
+    if payload is not None and payload["key"] == key:
+        if payload["stamp"] == stamp:
+            return _index_from_payload(filepath, payload)
+        # mtime/size moved (checkout, copy): only rebuild if the contents did too
+        digest = _file_digest(filepath)
+        if payload["sha256"] == digest:
+            payload["stamp"] = stamp
+            _write_index(path, payload)
+            return _index_from_payload(filepath, payload)
+
+    start = time.perf_counter()
+    index = _build_index(filepath, search_cols, output_cols)
+    _write_index(path, {
+        "version": INDEX_VERSION,
+        "key": key,
+        "stamp": stamp,
+        "sha256": _file_digest(filepath),
+        "bm25": index.bm25.to_dict(),
+        "columns": index.columns,
+        "rows": index.rows,
+        "offsets": index.lazy.offsets if index.lazy is not None else None
+    })
+    PHASE_TIMES["fit"] += time.perf_counter() - start
+    return index
+
+
+# Indexes already loaded by this process: (path, search_cols, output_cols) -> (stamp, SearchIndex)
+_LOADED = {}
+# Wall-clock seconds spent per phase ("load", "fit", "score") in this process, see search.py --profile
+PHASE_TIMES = defaultdict(float)
+
+
+def load_index(filepath, search_cols, output_cols):
+    """Return the index for a CSV, reusing the in-process copy while the CSV is unchanged"""
+    filepath = Path(filepath)
+    stamp = _source_stamp(filepath)
+    key = (str(filepath), tuple(search_cols), tuple(output_cols))
+
+    cached = _LOADED.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    start = time.perf_counter()
+    fit_before = PHASE_TIMES["fit"]
+    index = _load_compiled_index(filepath, search_cols, output_cols, stamp)
+    PHASE_TIMES["load"] += time.perf_counter() - start - (PHASE_TIMES["fit"] - fit_before)
+    index.stamp = stamp
+    _LOADED[key] = (stamp, index)
+    return index
+
+
+# ============ CUSTOM DATA ============
+def register_domain(name, filepath, like=None, search_cols=None, output_cols=None):
+    """Add a searchable domain backed by an external CSV/JSONL file.
+
+    Columns default to those of the bundled domain `like`, so exports that
+    follow the CSV_CONFIG column conventions need no extra configuration.
+    """
+    base = CSV_CONFIG[like] if like else {}
+    search_cols = search_cols or base.get("search_cols")
+    output_cols = output_cols or base.get("output_cols")
+    if not search_cols or not output_cols:
+        raise ValueError(f"Domain {name!r} needs search_cols and output_cols (or like=<domain>)")
+    CSV_CONFIG[name] = {
+        "file": str(Path(filepath).resolve()),
+        "search_cols": list(search_cols),
+        "output_cols": list(output_cols)
+    }
+    return name
+
+
+def register_stack(name, filepath):
+    """Add a stack backed by an external CSV/JSONL file with the common stack columns"""
+    STACK_CONFIG[name] = {"file": str(Path(filepath).resolve())}
+    if name not in AVAILABLE_STACKS:
+        AVAILABLE_STACKS.append(name)
+    return name
+
+
+def register_data_dir(path, prefix=None):
+    """Register every domain and stack file in a directory laid out like data/.
+
+    `<dir>/colors.csv` (or `colors.jsonl`) becomes domain `<prefix>-color` with
+    the bundled color columns; `<dir>/stacks/<name>.csv|jsonl` becomes stack
+    `<prefix>-<name>`. The prefix defaults to the directory name.
+    """
+    path = Path(path)
+    if not path.is_dir():
+        raise ValueError(f"Data directory not found: {path}")
+    prefix = prefix or path.name
+    names = []
+    for domain in list(_BUNDLED_DOMAINS):
+        stem = Path(CSV_CONFIG[domain]["file"]).stem
+        for ext in (".csv", ".jsonl"):
+            if (path / (stem + ext)).is_file():
+                names.append(register_domain(f"{prefix}-{domain}", path / (stem + ext), like=domain))
+                break
+    stacks_dir = path / "stacks"
+    if stacks_dir.is_dir():
+        for filepath in sorted(stacks_dir.iterdir()):
+            if filepath.suffix.lower() in (".csv", ".jsonl"):
+                names.append(register_stack(f"{prefix}-{filepath.stem}", filepath))
+    return names
+
+
+_BUNDLED_DOMAINS = tuple(CSV_CONFIG)
+
+
+# ============ SEARCH FUNCTIONS ============
+class QueryCache:
+    """Bounded LRU map from normalized queries to result rows, with hit/miss counters.
+
+    Keys include the source's stamp and INDEX_VERSION, so an edited source
+    file or a new index format never serves stale results; old entries just
+    age out.
+    """
+
+    def __init__(self, maxsize=QUERY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+    def get(self, key):
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return results
 
-    return results
+    def put(self, key, results):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+# Results of _search_csv() in this process, shared by search(), search_stack(), batch mode and the daemon
+QUERY_CACHE = QueryCache()
+
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results):
+    """Core search function using BM25, memoized in QUERY_CACHE"""
+    if not filepath.exists():
+        return []
+
+    index = load_index(filepath, search_cols, output_cols)
+    start = time.perf_counter()
+    tokens = index.bm25.tokenize(query)
+    key = (str(filepath), tuple(search_cols), tuple(output_cols), tuple(tokens), max_results,
+           FUZZY_SEARCH, INDEX_VERSION, index.stamp)
+    results = QUERY_CACHE.get(key)
+    if results is None:
+        ranked = index.bm25.top_k(tokens, max_results, FUZZY_SEARCH)
+        results = [index.row(idx) for idx, _ in ranked]
+        QUERY_CACHE.put(key, results)
+    PHASE_TIMES["score"] += time.perf_counter() - start
+    # Copies, so callers can't edit the cached rows
+    return [dict(row) for row in results]
 
 
 def detect_domain(query):
@@ -195,8 +893,47 @@ def detect_domain(query):
     return best if scores[best] > 0 else "style"
 
 
-def search(query, domain=None, max_results=MAX_RESULTS):
-    """Main search function with auto-domain detection"""
+def route_domains(query):
+    """Rank domains for a query from their pre-built BM25 statistics.
+
+    For each domain index: `idf_mass` is the share of the query's idf that
+    the domain's vocabulary covers, and `best_hit` is its top document's
+    score over the query's best attainable score (see BM25.max_score).
+    Domains are ranked by best_hit, then idf_mass.
+    """
+    tokens = BM25().tokenize(query)
+    routes = []
+    for domain, file, search_cols, output_cols in _sources():
+        filepath = DATA_DIR / file
+        if not filepath.exists():
+            continue
+        bm25 = load_index(filepath, search_cols, output_cols).bm25
+        start = time.perf_counter()
+        unseen_idf = log((bm25.N + 0.5) / 0.5 + 1)
+        total_idf = sum(bm25.term_idf(token, unseen_idf) for token in tokens)
+        matched_idf = sum(bm25.term_idf(token, 0.0) for token in tokens)
+        best = bm25.top_k(tokens, 1, FUZZY_SEARCH)
+        routes.append({
+            "domain": domain,
+            "idf_mass": round(matched_idf / total_idf, 4) if total_idf else 0.0,
+            "best_hit": round(best[0][1] / bm25.max_score(tokens), 4) if best else 0.0
+        })
+        PHASE_TIMES["score"] += time.perf_counter() - start
+    routes.sort(key=lambda route: (-route["best_hit"], -route["idf_mass"]))
+    return routes
+
+
+def search(query, domain=None, max_results=MAX_RESULTS, route=False):
+    """Main search function with auto-domain detection.
+
+    With route=True an unspecified domain is picked by route_domains()
+    instead of keyword matching, and the ranking is returned as "routing".
+    """
+    routing = None
+    if domain is None and route:
+        routing = route_domains(query)
+        if routing and routing[0]["best_hit"] > 0:
+            domain = routing[0]["domain"]
     if domain is None:
         domain = detect_domain(query)
 
@@ -208,13 +945,16 @@ def search(query, domain=None, max_results=MAX_RESULTS):
 
     results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
 
-    return {
+    result = {
         "domain": domain,
         "query": query,
         "file": config["file"],
         "count": len(results),
         "results": results
     }
+    if routing is not None:
+        result["routing"] = routing
+    return result
 
 
 def search_stack(query, stack, max_results=MAX_RESULTS):
@@ -237,3 +977,73 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+def _sources(domains=None, stacks=()):
+    """Yield (name, file, search_cols, output_cols) for the given domains (default: all) and stacks"""
+    for domain in (CSV_CONFIG if domains is None else domains):
+        config = CSV_CONFIG[domain]
+        yield domain, config["file"], config["search_cols"], config["output_cols"]
+    for stack in stacks:
+        yield f"stack:{stack}", STACK_CONFIG[stack]["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]
+
+
+def search_all(query, stack=None, max_results=MAX_RESULTS):
+    """Search every domain (plus an optional stack) and merge into one ranking.
+
+    Scores are divided by the query's best attainable score in each index so
+    hits from CSVs of different size and vocabulary are comparable.
+    """
+    if stack is not None and stack not in STACK_CONFIG:
+        return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
+
+    tokens = BM25().tokenize(query)
+    hits = []
+    searched = []
+    for order, (name, file, search_cols, output_cols) in enumerate(_sources(stacks=[stack] if stack else ())):
+        filepath = DATA_DIR / file
+        if not filepath.exists():
+            continue
+        searched.append(name)
+        index = load_index(filepath, search_cols, output_cols)
+        start = time.perf_counter()
+        bound = index.bm25.max_score(tokens)
+        for idx, score in index.bm25.top_k(tokens, max_results, FUZZY_SEARCH):
+            hits.append((-score / bound, order, idx, name, file, index))
+        PHASE_TIMES["score"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits.sort(key=lambda hit: hit[:3])
+    results = [{
+        "domain": name,
+        "file": file,
+        "score": round(-neg_score, 4),
+        "row": index.row(idx)
+    } for neg_score, _, idx, name, file, index in hits[:max_results]]
+    PHASE_TIMES["score"] += time.perf_counter() - start
+
+    return {
+        "domain": "all",
+        "domains": searched,
+        "stack": stack,
+        "query": query,
+        "count": len(results),
+        "results": results
+    }
+
+
+def warm_indexes():
+    """Load every domain and stack index into this process; returns the count loaded"""
+    loaded = 0
+    for _, file, search_cols, output_cols in _sources(stacks=AVAILABLE_STACKS):
+        filepath = DATA_DIR / file
+        if filepath.exists():
+            load_index(filepath, search_cols, output_cols)
+            loaded += 1
+    return loaded
+
+
+# Extra data directories, separated like PATH (also inherited by a spawned search daemon)
+for _data_dir in os.environ.get("UI_UX_PRO_MAX_DATA_DIRS", "").split(os.pathsep):
+    if _data_dir and Path(_data_dir).is_dir():
+        register_data_dir(_data_dir)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Protocol - JSON-RPC constants and socket location shared by server.py and client.py
+Imports nothing from core, so a --daemon client starts without loading the search engine.
+"""
+
+import os
+import stat
+import tempfile
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+def default_socket_path():
+    """Per-user socket path, overridable with UI_UX_PRO_MAX_SOCKET.
+
+    Lives in $XDG_RUNTIME_DIR, else in a ui-ux-pro-max-<uid> directory in the
+    temp dir that server.py creates with mode 0700.
+    """
+    path = os.environ.get("UI_UX_PRO_MAX_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "ui-ux-pro-max.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"ui-ux-pro-max-{uid}", "search.sock")
+
+
+def check_socket_dir(path):
+    """Raise PermissionError if other users could put their own socket at `path`.
+
+    The directory must belong to this user (or root) and must not be writable
+    by others unless it is sticky like /tmp, where nobody can replace a socket
+    they don't own.
+    """
+    if not hasattr(os, "getuid"):
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    info = os.stat(directory)
+    writable_by_others = info.st_mode & 0o022 and not info.st_mode & stat.S_ISVTX
+    if info.st_uid not in (os.getuid(), 0) or writable_by_others:
+        raise PermissionError(f"{directory} is not private to the current user")
+
+
+def check_socket(path):
+    """Raise PermissionError unless `path` is a socket owned by this user (FileNotFoundError if absent)"""
+    check_socket_dir(path)
+    info = os.lstat(path)
+    if not stat.S_ISSOCK(info.st_mode) or (hasattr(os, "getuid") and info.st_uid != os.getuid()):
+        raise PermissionError(f"{path} is not a socket owned by the current user")
@@ -3,13 +3,31 @@
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+       python search.py "<query>" --all [--stack <stack>]   (every domain, one merged ranking)
+       python search.py --batch [requests.jsonl]   (JSONL in, JSONL out; default stdin)
+       Add --daemon to answer through the resident server.py (spawned on first use)
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
 """
 
+import time
+_STARTED = time.perf_counter()
+
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
+import json
+import sys
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, PHASE_TIMES, QUERY_CACHE, search, search_stack, search_all, register_data_dir
+_IMPORTED = time.perf_counter()
+
+
+def _format_row(output, row):
+    for key, value in row.items():
+        value_str = str(value)
+        if len(value_str) > 300:
+            value_str = value_str[:300] + "..."
+        output.append(f"- **{key}:** {value_str}")
+    output.append("")
 
 
 def format_output(result):
@@ -18,44 +36,145 @@ def format_output(result):
         return f"Error: {result['error']}"
 
     output = []
+    if result["domain"] == "all":
+        output.append(f"## UI Pro Max Federated Results")
+        stack = f" | **Stack:** {result['stack']}" if result.get("stack") else ""
+        output.append(f"**Domains:** {', '.join(result['domains'])}{stack} | **Query:** {result['query']}")
+        output.append(f"**Found:** {result['count']} results\n")
+        for i, hit in enumerate(result['results'], 1):
+            output.append(f"### Result {i} ({hit['domain']}, score {hit['score']})")
+            _format_row(output, hit['row'])
+        return "\n".join(output)
+
     if result.get("stack"):
         output.append(f"## UI Pro Max Stack Guidelines")
         output.append(f"**Stack:** {result['stack']} | **Query:** {result['query']}")
     else:
         output.append(f"## UI Pro Max Search Results")
         output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}")
+        if result.get("routing"):
+            routes = ", ".join(f"{r['domain']} {r['best_hit']}" for r in result["routing"][:4])
+            output.append(f"**Routing:** {routes}")
     output.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
 
     for i, row in enumerate(result['results'], 1):
         output.append(f"### Result {i}")
-        for key, value in row.items():
-            value_str = str(value)
-            if len(value_str) > 300:
-                value_str = value_str[:300] + "..."
-            output.append(f"- **{key}:** {value_str}")
-        output.append("")
+        _format_row(output, row)
 
     return "\n".join(output)
 
 
+def run_request(request, max_results=MAX_RESULTS):
+    """Answer one batch request: {"query", "domain"?, "stack"?, "all"?, "route"?, "max_results"?, "id"?}"""
+    if not isinstance(request, dict) or not isinstance(request.get("query"), str):
+        return {"error": "Request must be an object with a string 'query'"}
+
+    domain = request.get("domain")
+    if domain is not None and domain not in CSV_CONFIG:
+        return {"error": f"Unknown domain: {domain}. Available: {', '.join(CSV_CONFIG)}"}
+    try:
+        n = int(request.get("max_results", max_results))
+    except (TypeError, ValueError):
+        return {"error": f"Invalid max_results: {request.get('max_results')!r}"}
+
+    if request.get("all"):
+        return search_all(request["query"], request.get("stack"), n)
+    if request.get("stack"):
+        return search_stack(request["query"], request["stack"], n)
+    return search(request["query"], domain, n, bool(request.get("route")))
+
+
+def run_batch(lines, out, max_results=MAX_RESULTS):
+    """Stream JSONL requests to JSONL results; indexes stay loaded across the batch"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            result = {"error": f"Invalid JSON: {e}"}
+        else:
+            try:
+                result = run_request(request, max_results)
+            except ValueError as e:  # --daemon: the server rejected the request
+                result = {"error": str(e)}
+            if isinstance(request, dict) and "id" in request:
+                result = {"id": request["id"], **result}
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+
+
+def format_profile(format_seconds, daemon=False):
+    """One-line phase breakdown (ms) for --profile, written to stderr.
+
+    With --daemon the searches run in the server, so load/fit/score and the
+    cache counters only cover this client process.
+    """
+    phases = [("import", _IMPORTED - _STARTED)]
+    phases += [(name, PHASE_TIMES[name]) for name in ("load", "fit", "score")]
+    phases += [("format", format_seconds), ("total", time.perf_counter() - _STARTED)]
+    line = " | ".join(f"{name} {seconds * 1000:.2f} ms" for name, seconds in phases)
+    line = f"[profile] {line} | cache {QUERY_CACHE.hits} hits / {QUERY_CACHE.misses} misses"
+    if daemon:
+        line += " (local stats only; searches ran in the daemon)"
+    return line
+
+
 if __name__ == "__main__":
+    # Extra data dirs add domain/stack choices, so register them before building the parser
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--data-dir", action="append", default=[])
+    for data_dir in pre.parse_known_args()[0].data_dir:
+        register_data_dir(data_dir)
+
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
+    parser.add_argument("--route", "-r", action="store_true", help="Without --domain, pick the domain from index statistics and include the routing scores")
+    parser.add_argument("--all", "-a", action="store_true", help="Search every domain (and --stack, if given) with one merged ranking")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE", help="Read JSONL requests from FILE (default: stdin), write JSONL results")
+    parser.add_argument("--daemon", action="store_true", help="Query the resident search daemon, starting it if needed")
+    parser.add_argument("--profile", action="store_true", help="Print a phase timing breakdown (import, load, fit, score, format) to stderr")
+    parser.add_argument("--data-dir", action="append", default=[], metavar="DIR", help="Extra data directory laid out like data/ (repeatable; the daemon reads UI_UX_PRO_MAX_DATA_DIRS instead)")
 
     args = parser.parse_args()
 
-    # Stack search takes priority
-    if args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
-    else:
-        result = search(args.query, args.domain, args.max_results)
+    if args.daemon:
+        from client import search, search_stack, search_all
+
+    if args.batch:
+        if args.batch == "-":
+            run_batch(sys.stdin, sys.stdout, args.max_results)
+        else:
+            with open(args.batch, 'r', encoding='utf-8') as f:
+                run_batch(f, sys.stdout, args.max_results)
+        if args.profile:
+            print(format_profile(0.0, args.daemon), file=sys.stderr)
+        sys.exit(0)
+    if args.query is None:
+        parser.error("the following arguments are required: query (or use --batch)")
+
+    # --all takes priority, then stack search
+    try:
+        if args.all:
+            result = search_all(args.query, args.stack, args.max_results)
+        elif args.stack:
+            result = search_stack(args.query, args.stack, args.max_results)
+        else:
+            result = search(args.query, args.domain, args.max_results, args.route)
+    except ValueError as e:  # --daemon: the server rejected the request
+        result = {"error": str(e)}
 
+    format_start = time.perf_counter()
     if args.json:
-        import json
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        output = json.dumps(result, indent=2, ensure_ascii=False)
     else:
-        print(format_output(result))
+        output = format_output(result)
+    format_seconds = time.perf_counter() - format_start
+    print(output)
+    if args.profile:
+        print(format_profile(format_seconds, args.daemon), file=sys.stderr)
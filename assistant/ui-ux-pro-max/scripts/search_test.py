@@ -0,0 +1,550 @@
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import core
+import search
+
+SEARCH = Path(__file__).parent / "search.py"
+SERVER = Path(__file__).parent / "server.py"
+
+# Wall-clock budget for a one-shot CLI search once its index is compiled.
+# Interpreter startup is most of it; loading and scoring should stay in the noise.
+STARTUP_BUDGET_SECONDS = 0.5
+
+
+def run_search(*args):
+    return subprocess.run([sys.executable, str(SEARCH), *args], capture_output=True, text=True, check=True)
+
+
+def write_csv(path, names):
+    """A small style-like CSV with one row per name"""
+    lines = ["Name,Keywords,Notes"]
+    lines += [f"{name},{name} keyword,notes about {name}" for name in names]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def top_names(filepath, query, n=3):
+    """Names of the best rows for query in a write_csv() file"""
+    rows = core._search_csv(filepath, ["Name", "Keywords"], ["Name", "Notes"], query, n)
+    return [row["Name"] for row in rows]
+
+
+class TempIndexTestCase(unittest.TestCase):
+    """Compiles indexes into a temporary INDEX_DIR, so tests never touch the real one"""
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp.name)
+        self.saved_index_dir = core.INDEX_DIR
+        core.INDEX_DIR = self.dir / "index"
+
+    def tearDown(self):
+        core.INDEX_DIR = self.saved_index_dir
+        core._LOADED.clear()
+        self.temp.cleanup()
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestSearchStartup(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # compile the color index outside the timed runs
+        run_search("x", "--domain", "color")
+
+    def test_startup_within_budget(self):
+        """A cached single-domain search stays under the wall-clock budget"""
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            run_search("x", "--domain", "color")
+            timings.append(time.perf_counter() - start)
+        self.assertLess(min(timings), STARTUP_BUDGET_SECONDS, f"runs took {timings}")
+
+    def test_profile_breakdown(self):
+        """--profile reports every phase on stderr and leaves stdout untouched"""
+        result = run_search("glassmorphism", "--domain", "style", "--profile")
+        self.assertIn("## UI Pro Max Search Results", result.stdout)
+        self.assertNotIn("[profile]", result.stdout)
+        for phase in ("import", "load", "fit", "score", "format", "total"):
+            self.assertIn(f"{phase} ", result.stderr)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCompiledIndex(TempIndexTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.csv = write_csv(self.dir / "styles.csv", ["alpha", "beta"])
+        self.assertEqual(top_names(self.csv, "alpha", 1), ["alpha"])
+        self.index_file = core._index_path(self.csv)
+        self.assertTrue(self.index_file.is_file())
+
+    def reload(self):
+        """Forget the in-process copy, so the next search goes through the pickle"""
+        core._LOADED.clear()
+
+    def test_rebuilt_when_csv_grows(self):
+        """Rows appended to the CSV (new size and mtime) are found after a reload"""
+        write_csv(self.csv, ["alpha", "beta", "gamma"])
+        self.reload()
+        self.assertEqual(top_names(self.csv, "gamma", 1), ["gamma"])
+
+    def test_rebuilt_when_only_mtime_changes(self):
+        """A same-size edit is caught through the mtime and the content digest"""
+        before = self.csv.stat()
+        write_csv(self.csv, ["delta", "beta"])
+        os.utime(self.csv, ns=(before.st_atime_ns, before.st_mtime_ns + 10**9))
+        self.assertEqual(self.csv.stat().st_size, before.st_size)
+        self.reload()
+        self.assertEqual(top_names(self.csv, "delta", 1), ["delta"])
+        self.assertEqual(top_names(self.csv, "alpha", 1), [])
+
+    def test_touched_csv_reuses_index(self):
+        """A new mtime with unchanged contents only refreshes the stamp in the pickle"""
+        os.utime(self.csv, ns=(0, self.csv.stat().st_mtime_ns + 10**9))
+        self.reload()
+        self.assertEqual(top_names(self.csv, "beta", 1), ["beta"])
+        payload = core._read_index(self.index_file)
+        self.assertEqual(payload["stamp"], core._source_stamp(self.csv))
+
+    def test_corrupt_index_ignored(self):
+        """A truncated or garbage pickle is rebuilt from the CSV"""
+        for garbage in (b"", b"not a pickle", self.index_file.read_bytes()[:20]):
+            self.index_file.write_bytes(garbage)
+            self.reload()
+            self.assertEqual(top_names(self.csv, "beta", 1), ["beta"])
+            self.assertIsNotNone(core._read_index(self.index_file))
+
+    def test_stale_index_version_ignored(self):
+        """An index written by another INDEX_VERSION is rebuilt, not trusted"""
+        import pickle
+        payload = core._read_index(self.index_file)
+        payload["version"] = core.INDEX_VERSION - 1
+        payload["rows"] = [("planted", "")]
+        self.index_file.write_bytes(pickle.dumps(payload))
+        self.reload()
+        self.assertEqual(top_names(self.csv, "alpha", 1), ["alpha"])
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestQueryCache(TempIndexTestCase):
+
+    def test_lru_eviction_order(self):
+        """The least recently used entry is evicted first; a get() refreshes an entry"""
+        cache = core.QueryCache(maxsize=2)
+        cache.put("a", [1])
+        cache.put("b", [2])
+        self.assertEqual(cache.get("a"), [1])
+        cache.put("c", [3])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), [1])
+        self.assertEqual(cache.get("c"), [3])
+        cache.put("d", [4])
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.info(), {"hits": 3, "misses": 2, "size": 2, "maxsize": 2})
+
+    def test_disabled_cache_stores_nothing(self):
+        """maxsize 0 turns the cache off"""
+        cache = core.QueryCache(maxsize=0)
+        cache.put("a", [1])
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.info()["size"], 0)
+
+    def test_search_counts_hits_and_misses(self):
+        """A repeated search is a hit and returns equal rows that are copies of the cached ones"""
+        csv_file = write_csv(self.dir / "styles.csv", ["alpha", "beta"])
+        before = core.QUERY_CACHE.info()
+        first = core._search_csv(csv_file, ["Name"], ["Name"], "alpha", 1)
+        first[0]["Name"] = "edited"
+        second = core._search_csv(csv_file, ["Name"], ["Name"], "alpha", 1)
+        self.assertEqual(second, [{"Name": "alpha"}])
+        after = core.QUERY_CACHE.info()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_rebuilt_index_invalidates_results(self):
+        """Editing the source changes its stamp, so cached results for it are not served"""
+        csv_file = write_csv(self.dir / "styles.csv", ["alpha", "beta"])
+        self.assertEqual(top_names(csv_file, "alpha"), ["alpha"])
+        before = core.QUERY_CACHE.info()
+        write_csv(csv_file, ["beta", "gamma"])
+        self.assertEqual(top_names(csv_file, "alpha"), [])
+        self.assertEqual(core.QUERY_CACHE.info()["misses"] - before["misses"], 1)
+
+    def test_invalid_size_setting_keeps_default(self):
+        """A non-integer UI_UX_PRO_MAX_QUERY_CACHE falls back to the default size"""
+        result = subprocess.run(
+            [sys.executable, "-c", "import core; print(core.QUERY_CACHE.maxsize)"],
+            cwd=SEARCH.parent, env={**os.environ, "UI_UX_PRO_MAX_QUERY_CACHE": "lots"},
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(int(result.stdout), 256)
+
+
+# Quoted commas, quotes, embedded newlines, blank lines and a short row, as real exports have
+TRICKY_CSV = (
+    'Name,Keywords,Notes\n'
+    'alpha,"one, two",plain\n'
+    '\n'
+    'beta,"say ""hi""","line one\nline two"\n'
+    '\n'
+    '\n'
+    'gamma,caf\u00e9 \u00fcber,last\n'
+    'delta,short row\n'
+)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCustomData(TempIndexTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.saved = (dict(core.CSV_CONFIG), dict(core.STACK_CONFIG), list(core.AVAILABLE_STACKS))
+
+    def tearDown(self):
+        csv_config, stack_config, stacks = self.saved
+        for config, saved in ((core.CSV_CONFIG, csv_config), (core.STACK_CONFIG, stack_config)):
+            config.clear()
+            config.update(saved)
+        core.AVAILABLE_STACKS[:] = stacks
+        super().tearDown()
+
+    def test_register_data_dir(self):
+        """A data dir's colors.csv and stacks/*.jsonl become searchable domain and stack"""
+        extra = self.dir / "extra"
+        (extra / "stacks").mkdir(parents=True)
+        header = ",".join(f'"{col}"' for col in core.CSV_CONFIG["color"]["output_cols"])
+        (extra / "colors.csv").write_text(
+            f"{header}\nAurora Banking,fintech aurora,#111111,#222222,#333333,#444444,#555555,#666666,custom\n",
+            encoding="utf-8",
+        )
+        record = {col: "" for col in core._STACK_COLS["output_cols"]}
+        record.update(Category="Widgets", Guideline="Use sprockets for widget layout")
+        (extra / "stacks" / "widgets.jsonl").write_text(json.dumps(record) + "\n", encoding="utf-8")
+
+        self.assertEqual(core.register_data_dir(extra), ["extra-color", "extra-widgets"])
+        self.assertIn("extra-widgets", core.AVAILABLE_STACKS)
+
+        result = core.search("aurora fintech", "extra-color", 1)
+        self.assertEqual(result["results"][0]["Primary (Hex)"], "#111111")
+        result = core.search_stack("sprockets", "extra-widgets", 1)
+        self.assertEqual(result["results"][0]["Category"], "Widgets")
+
+    def test_missing_data_dir(self):
+        """A data dir that doesn't exist is a ValueError"""
+        with self.assertRaises(ValueError):
+            core.register_data_dir(self.dir / "missing")
+
+    def rows(self, filepath, lazy):
+        """Every output row of filepath's index, built lazily (by offset) or eagerly"""
+        saved = core.LAZY_ROWS_BYTES
+        core.LAZY_ROWS_BYTES = 0 if lazy else 1 << 30
+        try:
+            index = core._build_index(filepath, ["Name", "Keywords"], ["Name", "Keywords", "Notes"])
+        finally:
+            core.LAZY_ROWS_BYTES = saved
+        self.assertEqual(index.lazy is not None, lazy or core._is_jsonl(filepath))
+        return [index.row(idx) for idx in range(index.bm25.N)]
+
+    def test_lazy_rows_match_eager_rows(self):
+        """Rows read back by byte offset equal the rows parsed while building"""
+        csv_file = self.dir / "tricky.csv"
+        csv_file.write_text(TRICKY_CSV, encoding="utf-8")
+        eager = self.rows(csv_file, lazy=False)
+        self.assertEqual([row["Name"] for row in eager], ["alpha", "beta", "gamma", "delta"])
+        self.assertEqual(eager[1]["Notes"], "line one\nline two")
+        self.assertIsNone(eager[3]["Notes"])  # short row, like csv.DictReader
+        self.assertEqual(self.rows(csv_file, lazy=True), eager)
+
+    def test_jsonl_rows_match_csv_rows(self):
+        """The same records as JSONL give the rows of the CSV, via offsets and the pickle"""
+        csv_file = self.dir / "tricky.csv"
+        csv_file.write_text(TRICKY_CSV.replace("delta,short row", "delta,short row,"), encoding="utf-8")
+        jsonl_file = self.dir / "tricky.jsonl"
+        records = [
+            {"Name": name, "Keywords": keywords, "Notes": notes}
+            for name, keywords, notes in (
+                ("alpha", "one, two", "plain"),
+                ("beta", 'say "hi"', "line one\nline two"),
+                ("gamma", "caf\u00e9 \u00fcber", "last"),
+                ("delta", "short row", ""),
+            )
+        ]
+        jsonl_file.write_text("".join(json.dumps(r) + "\n\n" for r in records), encoding="utf-8")
+        self.assertEqual(self.rows(jsonl_file, lazy=False), self.rows(csv_file, lazy=False))
+
+        index = core.load_index(jsonl_file, ["Name", "Keywords"], ["Name", "Keywords", "Notes"])
+        core._LOADED.clear()
+        reloaded = core.load_index(jsonl_file, ["Name", "Keywords"], ["Name", "Keywords", "Notes"])
+        self.assertIsNot(reloaded, index)
+        self.assertEqual([reloaded.row(i) for i in range(4)], records)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestTypoTolerance(unittest.TestCase):
+
+    def test_prefix_and_typo_queries_match(self):
+        """Truncated and misspelled terms still find the row the full word would"""
+        for query in ("glassmorph", "glasmorphism"):
+            result = run_search(query, "--domain", "style", "-n", "1")
+            self.assertIn("Glassmorphism", result.stdout, query)
+
+
+
+def random_queries(bm25, count, rng):
+    """Queries of 1-5 vocabulary terms, some truncated or misspelled to exercise fuzzy expansion"""
+    queries = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(1, 5)):
+            word = rng.choice(bm25.terms)
+            if len(word) > 6 and rng.random() < 0.3:
+                i = rng.randrange(1, len(word) - 1)
+                word = rng.choice([word[:-1], word[:i] + word[i + 1:], word[:i] + word[i + 1] + word[i] + word[i + 2:]])
+            words.append(word)
+        queries.append(" ".join(words))
+    return queries
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRanking(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.indexes = [
+            core.load_index(core.DATA_DIR / file, search_cols, output_cols).bm25
+            for _, file, search_cols, output_cols in core._sources(stacks=core.AVAILABLE_STACKS)
+        ]
+
+    def test_top_k_matches_full_ranking(self):
+        """MaxScore top_k() returns exactly the positive head of score_tokens(), ties included"""
+        rng = random.Random(0)
+        for bm25 in self.indexes:
+            for query in random_queries(bm25, 40, rng):
+                tokens = bm25.tokenize(query)
+                for fuzzy in (False, True):
+                    ranked = [hit for hit in bm25.score_tokens(tokens, fuzzy) if hit[1] > 0]
+                    for k in (1, 3, 10):
+                        self.assertEqual(bm25.top_k(tokens, k, fuzzy), ranked[:k], (query, fuzzy, k))
+
+    def test_top_k_repeated_terms_and_misses(self):
+        """Repeated tokens count twice, unknown tokens contribute nothing, k <= 0 is empty"""
+        bm25 = self.indexes[0]
+        term = bm25.terms[0]
+        tokens = [term, term, "zzzznotaword"]
+        self.assertEqual(bm25.top_k(tokens, 5), [hit for hit in bm25.score_tokens(tokens) if hit[1] > 0][:5])
+        self.assertEqual(bm25.top_k(["zzzznotaword"], 5), [])
+        self.assertEqual(bm25.top_k([term], 0), [])
+
+    def assert_batch_matches_score(self):
+        rng = random.Random(1)
+        for bm25 in self.indexes:
+            queries = random_queries(bm25, 30, rng) + ["", "zzzznotaword"]
+            for k in (1, 3, None):
+                for query, ranked in zip(queries, bm25.score_batch(queries, k)):
+                    expected = bm25.score(query)[:k]
+                    self.assertEqual([idx for idx, _ in ranked], [idx for idx, _ in expected], (query, k))
+                    for (_, got), (_, want) in zip(ranked, expected):
+                        self.assertAlmostEqual(got, want, places=9)
+
+    @unittest.skipIf(core._vectorized_backend() is None, "NumPy and SciPy are not installed")
+    def test_score_batch_vectorized(self):
+        """The sparse-matrix score_batch() ranks like score() per query"""
+        self.assert_batch_matches_score()
+
+    def test_score_batch_fallback(self):
+        """Without NumPy/SciPy, score_batch() is score() per query"""
+        saved = core._VECTORIZED
+        core._VECTORIZED = None
+        try:
+            self.assert_batch_matches_score()
+        finally:
+            core._VECTORIZED = saved
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRouting(unittest.TestCase):
+
+    COLOR_QUERY = "trust blue accent contrast palette"
+
+    def assert_sorted(self, routing):
+        keys = [(-route["best_hit"], -route["idf_mass"]) for route in routing]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_color_query_routes_to_color(self):
+        """A palette query ranks the color domain first, over every domain, best first"""
+        routing = core.route_domains(self.COLOR_QUERY)
+        self.assertEqual(routing[0]["domain"], "color")
+        self.assertEqual({route["domain"] for route in routing}, set(core.CSV_CONFIG))
+        self.assert_sorted(routing)
+        for route in routing:
+            self.assertTrue(0 <= route["best_hit"] <= 1 and 0 <= route["idf_mass"] <= 1, route)
+
+    def test_search_with_route(self):
+        """search(route=True) searches the top routed domain and returns the routing"""
+        result = core.search(self.COLOR_QUERY, route=True)
+        self.assertEqual(result["domain"], "color")
+        self.assertEqual(result["routing"], core.route_domains(self.COLOR_QUERY))
+        self.assertNotIn("routing", core.search(self.COLOR_QUERY))
+
+    def test_unmatched_query_falls_back_to_keywords(self):
+        """With no domain matching, routing is all zeros and keyword detection picks the domain"""
+        result = core.search("zzqx", route=True)
+        self.assertEqual(result["domain"], core.detect_domain("zzqx"))
+        self.assertTrue(all(route["best_hit"] == 0 for route in result["routing"]))
+
+    def test_explicit_domain_skips_routing(self):
+        """A given domain is searched as is, with no routing attached"""
+        result = core.search(self.COLOR_QUERY, "style", route=True)
+        self.assertEqual(result["domain"], "style")
+        self.assertNotIn("routing", result)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestSearchAll(unittest.TestCase):
+
+    def per_domain_hits(self, query, sources, n):
+        """(normalized score, domain, row) of each source's own top n, best first"""
+        tokens = core.BM25().tokenize(query)
+        hits = []
+        for name, file, search_cols, output_cols in sources:
+            index = core.load_index(core.DATA_DIR / file, search_cols, output_cols)
+            bound = index.bm25.max_score(tokens)
+            for idx, score in index.bm25.top_k(tokens, n, core.FUZZY_SEARCH):
+                hits.append((round(score / bound, 4), name, index.row(idx)))
+        hits.sort(key=lambda hit: -hit[0])
+        return hits
+
+    def test_merged_ranking(self):
+        """Hits from every domain are merged by normalized score, each tagged with its domain"""
+        query = "dark mode glass dashboard"
+        result = core.search_all(query, max_results=5)
+        self.assertEqual(result["domains"], list(core.CSV_CONFIG))
+        self.assertEqual(result["count"], 5)
+        scores = [hit["score"] for hit in result["results"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertGreater(len({hit["domain"] for hit in result["results"]}), 1)
+
+        expected = self.per_domain_hits(query, core._sources(), 5)[:5]
+        self.assertEqual(
+            [(hit["score"], hit["domain"], hit["row"]) for hit in result["results"]], expected
+        )
+
+    def test_stack_included(self):
+        """With a stack, its guidelines join the ranking as domain 'stack:<name>'"""
+        result = core.search_all("react hooks state", "react", 3)
+        self.assertEqual(result["domains"][-1], "stack:react")
+        self.assertEqual(result["stack"], "react")
+        self.assertIn("stack:react", {hit["domain"] for hit in result["results"]})
+        without = core.search_all("react hooks state", None, 3)
+        self.assertNotIn("stack:react", without["domains"])
+
+    def test_unknown_stack(self):
+        """An unknown stack is reported rather than silently searched without"""
+        self.assertIn("Unknown stack", core.search_all("x", "nope")["error"])
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestBatch(unittest.TestCase):
+
+    def run_batch(self, *lines):
+        out = io.StringIO()
+        search.run_batch(lines, out)
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_results_in_request_order_with_ids(self):
+        """One result line per request, in order, echoing each request's id"""
+        results = self.run_batch(
+            json.dumps({"id": "a", "query": "glassmorphism", "domain": "style", "max_results": 1}),
+            "",
+            json.dumps({"id": 7, "query": "react hooks", "stack": "react"}),
+            json.dumps({"query": "pastel palette", "domain": "color"}),
+        )
+        self.assertEqual([r.get("id") for r in results], ["a", 7, None])
+        self.assertEqual(results[0]["domain"], "style")
+        self.assertEqual(results[0]["count"], 1)
+        self.assertEqual(results[1]["stack"], "react")
+        self.assertNotIn("id", results[2])
+
+    def test_bad_lines_get_per_line_errors(self):
+        """Invalid JSON, non-object requests, unknown domains and bad max_results fail alone"""
+        results = self.run_batch(
+            "{not json",
+            json.dumps(["query", "style"]),
+            json.dumps({"id": 1, "query": "x", "domain": "nope"}),
+            json.dumps({"id": 2, "query": "x", "max_results": "many"}),
+            json.dumps({"id": 3, "query": 5}),
+            json.dumps({"id": 4, "query": "minimal", "domain": "style"}),
+        )
+        self.assertEqual(len(results), 6)
+        self.assertIn("Invalid JSON", results[0]["error"])
+        self.assertIn("must be an object", results[1]["error"])
+        self.assertEqual(results[2]["id"], 1)
+        self.assertIn("Unknown domain: nope", results[2]["error"])
+        self.assertIn("Invalid max_results", results[3]["error"])
+        self.assertIn("must be an object", results[4]["error"])
+        self.assertNotIn("error", results[5])
+
+    def test_run_request_matches_search(self):
+        """A batch request answers exactly like the corresponding search() call"""
+        request = {"query": "dark mode dashboard", "domain": "style", "max_results": 2}
+        self.assertEqual(search.run_request(request), core.search("dark mode dashboard", "style", 2))
+        self.assertEqual(
+            search.run_request({"query": "glass", "all": True}), core.search_all("glass")
+        )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestDaemonDispatch(unittest.TestCase):
+
+    def test_bad_requests_get_errors_and_server_survives(self):
+        """Wrongly typed params and failing handlers answer with errors; later requests still work"""
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "search", "params": {"query": 1}},
+            {"jsonrpc": "2.0", "id": 2, "method": "search_stack", "params": {"query": "x", "stack": 3}},
+            {"jsonrpc": "2.0", "id": 3, "method": "ping"},
+        ]
+        result = subprocess.run(
+            [sys.executable, str(SERVER), "--stdio"],
+            input="".join(json.dumps(r) + "\n" for r in requests),
+            capture_output=True, text=True, check=True
+        )
+        responses = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual([r["id"] for r in responses], [1, 2, 3])
+        self.assertEqual(responses[0]["error"]["code"], -32602)
+        self.assertEqual(responses[1]["error"]["code"], -32602)
+        self.assertEqual(responses[2]["result"], "pong")
+
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestDaemonSocket(unittest.TestCase):
+
+    def test_socket_not_owned_by_user_is_refused(self):
+        """The client won't talk to anything at the socket path that isn't this user's socket"""
+        from client import DaemonUnavailable, SearchClient
+        with tempfile.TemporaryDirectory() as temp:
+            planted = Path(temp) / "search.sock"
+            planted.write_text("")
+            with self.assertRaises(DaemonUnavailable):
+                SearchClient(str(planted), spawn=False).connect()
+
+            shared = Path(temp) / "shared"
+            shared.mkdir()
+            shared.chmod(0o777)
+            with self.assertRaises(DaemonUnavailable):
+                SearchClient(str(shared / "search.sock"), spawn=False).connect()
+
+
+if __name__ == "__main__":
+    unittest.main()
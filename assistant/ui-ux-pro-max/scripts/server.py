@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Server - resident search daemon speaking line-delimited JSON-RPC 2.0
+Usage: python server.py --stdio
+       python server.py [--socket <path>] [--idle-timeout 900]
+
+Every domain and stack index is loaded once at startup and kept warm.
+Methods: search(query, domain?, max_results?, route?), search_stack(query, stack, max_results?),
+         search_all(query, stack?, max_results?), cache_info(), ping()
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from core import CSV_CONFIG, MAX_RESULTS, QUERY_CACHE, search, search_stack, search_all, warm_indexes
+from protocol import INTERNAL_ERROR, INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR, check_socket, check_socket_dir, default_socket_path
+
+
+def _check_str(name, value, optional=False):
+    """Reject a param that isn't a string (or None, when optional) before it reaches core"""
+    if not (isinstance(value, str) or (optional and value is None)):
+        raise TypeError(f"{name} must be a string{' or null' if optional else ''}")
+
+
+def _call_search(query, domain=None, max_results=MAX_RESULTS, route=False):
+    _check_str("query", query)
+    _check_str("domain", domain, optional=True)
+    if domain is not None and domain not in CSV_CONFIG:
+        return {"error": f"Unknown domain: {domain}. Available: {', '.join(CSV_CONFIG)}"}
+    return search(query, domain, int(max_results), bool(route))
+
+
+def _call_search_stack(query, stack, max_results=MAX_RESULTS):
+    _check_str("query", query)
+    _check_str("stack", stack)
+    return search_stack(query, stack, int(max_results))
+
+
+def _call_search_all(query, stack=None, max_results=MAX_RESULTS):
+    _check_str("query", query)
+    _check_str("stack", stack, optional=True)
+    return search_all(query, stack, int(max_results))
+
+
+METHODS = {
+    "search": _call_search,
+    "search_stack": _call_search_stack,
+    "search_all": _call_search_all,
+    "cache_info": QUERY_CACHE.info,
+    "ping": lambda: "pong"
+}
+
+
+def _error(req_id, code, message):
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+def dispatch(line):
+    """Handle one JSON-RPC request line, returning the response dict (None for notifications)"""
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        return _error(None, PARSE_ERROR, f"Parse error: {e}")
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return _error(None, INVALID_REQUEST, "Invalid request")
+
+    req_id = request.get("id")
+    method = METHODS.get(request["method"])
+    if method is None:
+        return _error(req_id, METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+
+    params = request.get("params", {})
+    try:
+        if isinstance(params, dict):
+            result = method(**params)
+        elif isinstance(params, list):
+            result = method(*params)
+        else:
+            return _error(req_id, INVALID_PARAMS, "params must be an object or array")
+    except (TypeError, ValueError) as e:
+        return _error(req_id, INVALID_PARAMS, f"Invalid params: {e}")
+    except Exception as e:  # a bad request must not take the daemon down
+        return _error(req_id, INTERNAL_ERROR, f"Internal error: {type(e).__name__}: {e}")
+
+    if "id" not in request:
+        return None
+    return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+
+def serve_stdio(infile=sys.stdin, outfile=sys.stdout):
+    """Answer JSON-RPC requests on stdin until EOF"""
+    for line in infile:
+        if not line.strip():
+            continue
+        response = dispatch(line)
+        if response is not None:
+            outfile.write(json.dumps(response, ensure_ascii=False) + "\n")
+            outfile.flush()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            self.server.touch()
+            if not line.strip():
+                continue
+            response = dispatch(line.decode("utf-8", errors="replace"))
+            if response is not None:
+                self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+
+class SearchServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that shuts itself down after `idle_timeout` seconds without requests"""
+
+    daemon_threads = True
+
+    def __init__(self, path, idle_timeout=None):
+        self.idle_timeout = idle_timeout
+        self.last_activity = time.monotonic()
+        super().__init__(path, _Handler)
+
+    def touch(self):
+        self.last_activity = time.monotonic()
+
+    def _watch_idle(self):
+        while True:
+            time.sleep(min(self.idle_timeout, 5))
+            if time.monotonic() - self.last_activity > self.idle_timeout:
+                self.shutdown()
+                return
+
+    def serve(self):
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        self.serve_forever()
+
+
+def _socket_alive(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def serve_unix(path, idle_timeout=None):
+    """Serve on a Unix socket; returns False if another server already owns `path`"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+    check_socket_dir(path)
+    if os.path.lexists(path):
+        try:
+            check_socket(path)
+        except PermissionError:
+            return False  # another user's file: never serve (or unlink) in its place
+        if _socket_alive(path):
+            return False
+        os.unlink(path)  # stale socket from a crashed server
+
+    old_umask = os.umask(0o077)
+    try:
+        server = SearchServer(path, idle_timeout)
+    except OSError:
+        # lost a spawn race to another server binding the same path
+        return False
+    finally:
+        os.umask(old_umask)
+
+    try:
+        server.serve()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Search Server")
+    parser.add_argument("--stdio", action="store_true", help="Serve JSON-RPC on stdin/stdout")
+    parser.add_argument("--socket", help="Unix socket path (default: per-user temp socket)")
+    parser.add_argument("--idle-timeout", type=float, default=900, help="Exit after this many idle seconds (0 = never, default: 900)")
+    args = parser.parse_args()
+
+    warm_indexes()
+    if args.stdio:
+        serve_stdio()
+    elif not hasattr(socket, "AF_UNIX"):
+        parser.error("Unix sockets are not available on this platform; use --stdio")
+    else:
+        serve_unix(args.socket or default_socket_path(), args.idle_timeout or None)
@@ -3,29 +3,77 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--workers N] [--full]
+                   [--compression fast|default|max]
+
+Parts left unchanged since unpack.py are copied compressed from the original
+file recorded in the unpack manifest; use --full to recompress everything.
+Already-compressed media is stored as-is; XML is deflated at the chosen level
+(fast while iterating, max for the final file).
 """
 
 import argparse
-import shutil
+import hashlib
+import json
+import os
+import struct
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
+import time
+import defusedxml.sax
+import io
+import xml.sax.handler
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Below this many XML parts, condensing serially beats starting a process pool
+PARALLEL_MIN_PARTS = 16
+
+# Deflate levels for XML and other compressible parts
+COMPRESSION_LEVELS = {"fast": 1, "default": 6, "max": 9}
+
+# Formats that are already compressed; deflating them again costs CPU for no gain
+STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".wdp", ".jxr", ".webp",
+    ".mp3", ".m4a", ".wma", ".ogg", ".mp4", ".m4v", ".mov", ".wmv", ".avi", ".webm",
+    ".zip", ".docx", ".pptx", ".xlsx", ".docm", ".pptm", ".xlsm",
+}
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes for condensing XML (default: CPU count, 1 = serial)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Recompress every part instead of reusing unchanged ones from the original",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSION_LEVELS,
+        default="default",
+        help="Deflate level for XML: fast while iterating, max for final output (default: default)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            workers=args.workers or os.cpu_count() or 1,
+            incremental=not args.full,
+            compress_level=COMPRESSION_LEVELS[args.compression],
+            verbose=True,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +90,35 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    workers=None,
+    incremental=True,
+    compress_level=None,
+    verbose=False,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    XML parts are condensed in memory and streamed into the archive; all other
+    parts are copied straight from input_dir, which is never modified.
+
+    With incremental packing, parts whose content still matches the manifest
+    written by unpack.py are copied as already-compressed entries from the
+    original file, so only edited parts are condensed and recompressed.
+    Already-compressed media (STORED_EXTENSIONS) is stored without deflate.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        workers: Processes for condensing XML (default: 1, serial; more need the
+            caller's entry point behind an `if __name__ == "__main__"` guard)
+        incremental: If True, reuse unchanged parts of the original (default: True)
+        compress_level: Deflate level 1-9 for XML and other compressible parts
+            (default: zlib's default, 6)
+        verbose: If True, print a summary of parts, sizes and time per category
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,34 +131,221 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    files = [f for f in input_dir.rglob("*") if f.is_file()]
+    original, reused = _unchanged_parts(input_dir, files) if incremental else (None, {})
+    xml_files = [f for f in files if _is_xml_part(f) and f not in reused]
+    workers = workers or 1
+
+    # Create final Office file as zip archive; when repacking over the original
+    # itself, its entries are still being read, so write beside it and swap
+    start = time.perf_counter()
+    stats = {}
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    same_file = original is not None and output_file.resolve() == Path(original.filename).resolve()
+    target = output_file.with_name(output_file.name + ".tmp") if same_file else output_file
+    try:
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED, compresslevel=compress_level) as zf:
+            if workers > 1 and len(xml_files) >= PARALLEL_MIN_PARTS:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    chunksize = max(1, len(xml_files) // (workers * 4))
+                    condensed = pool.map(condense_xml_bytes, xml_files, chunksize=chunksize)
+                    _write_parts(zf, input_dir, files, zip(xml_files, condensed), original, reused, stats)
+            else:
+                condensed = map(condense_xml_bytes, xml_files)
+                _write_parts(zf, input_dir, files, zip(xml_files, condensed), original, reused, stats)
+    finally:
+        if original is not None:
+            original.close()
+    if same_file:
+        os.replace(target, output_file)
+
+    if verbose:
+        level = "default" if compress_level is None else compress_level
+        print(f"Packed {output_file} in {time.perf_counter() - start:.2f}s (XML deflate level {level})")
+        for category, (count, size, compressed, seconds) in stats.items():
+            print(
+                f"  {category:<8} {count:>5} parts  {_format_size(size):>9} -> "
+                f"{_format_size(compressed):>9}  {seconds:6.2f}s"
+            )
+        print(f"  {'total':<8} {len(files):>5} parts  {'':>9}    {_format_size(output_file.stat().st_size):>9}")
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
+def _is_xml_part(path):
+    # not path.suffix: the package relationships part is named just ".rels"
+    return path.name.endswith((".xml", ".rels"))
+
+
+def _write_parts(zf, input_dir, files, condensed, original=None, reused=None, stats=None):
+    """Write files to zf in order, taking XML parts from the (path, bytes) iterator condensed
+
+    Files in reused map to their ZipInfo in original and are copied without recompressing.
+    stats collects [parts, bytes in, bytes out, seconds] per category.
+    """
+    reused = reused or {}
+    stats = {} if stats is None else stats
+    for f in files:
+        start = time.perf_counter()
+        arcname = f.relative_to(input_dir)
+        if f in reused:
+            category = "reused"
+            _copy_raw_entry(original, reused[f], zf)
+        elif _is_xml_part(f):
+            category = "xml"
+            xml_file, data = next(condensed)
+            assert xml_file == f
+            zinfo = zipfile.ZipInfo.from_file(f, arcname)
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(zinfo, data, compresslevel=zf.compresslevel)
+        elif f.suffix.lower() in STORED_EXTENSIONS:
+            category = "stored"
+            zf.write(f, arcname, compress_type=zipfile.ZIP_STORED)
+        else:
+            category = "deflated"
+            zf.write(f, arcname)
+        info = zf.filelist[-1]
+        totals = stats.setdefault(category, [0, 0, 0, 0.0])
+        totals[0] += 1
+        totals[1] += info.file_size
+        totals[2] += info.compress_size
+        totals[3] += time.perf_counter() - start
+
+
+def _format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def manifest_path(unpacked_dir):
+    """Location of the unpack manifest: a hidden file beside the directory, so it is never packed"""
+    unpacked_dir = Path(unpacked_dir).resolve()
+    return unpacked_dir.parent / f".{unpacked_dir.name}.manifest.json"
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_manifest(unpacked_dir, original_file):
+    """Record the original file and the hash of every unpacked part, for incremental packing"""
+    unpacked_dir = Path(unpacked_dir)
+    original_file = Path(original_file).resolve()
+    stat = original_file.stat()
+    parts = {}
+    for f in unpacked_dir.rglob("*"):
+        if f.is_file():
+            parts[f.relative_to(unpacked_dir).as_posix()] = {
+                "size": f.stat().st_size,
+                "sha256": _file_sha256(f),
+            }
+    manifest = {
+        "original": str(original_file),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "parts": parts,
+    }
+    manifest_path(unpacked_dir).write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+
+
+def _unchanged_parts(input_dir, files):
+    """Return (open original ZipFile, {path: ZipInfo}) for parts unchanged since unpacking.
+
+    Returns (None, {}) when there is no manifest or the original file has
+    changed or disappeared since it was unpacked.
+    """
+    try:
+        manifest = json.loads(manifest_path(input_dir).read_text(encoding="utf-8"))
+        stat = os.stat(manifest["original"])
+    except (OSError, ValueError, KeyError):
+        return None, {}
+    if (stat.st_size, stat.st_mtime_ns) != (manifest["size"], manifest["mtime_ns"]):
+        return None, {}
+
+    try:
+        original = zipfile.ZipFile(manifest["original"])
+    except zipfile.BadZipFile:
+        return None, {}
+    entries = {info.filename: info for info in original.infolist()}
+    reused = {}
+    for f in files:
+        name = f.relative_to(input_dir).as_posix()
+        record = manifest["parts"].get(name)
+        info = entries.get(name)
+        if (
+            record is not None
+            and info is not None
+            and not info.flag_bits & 0x1  # encrypted
+            and f.stat().st_size == record["size"]
+            and _file_sha256(f) == record["sha256"]
+        ):
+            reused[f] = info
+    if not reused:
+        original.close()
+        return None, {}
+    return original, reused
+
+
+def _copy_raw_entry(source, info, zf):
+    """Append member info of ZipFile source to zf as-is, without decompressing it.
+
+    zipfile has no public API for this, so the local header is written here
+    and the entry registered the way ZipFile.writestr() does.
+    """
+    source.fp.seek(info.header_offset)
+    header = source.fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    source.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+    data = source.fp.read(info.compress_size)
+
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.external_attr = info.external_attr
+    zinfo.create_system = info.create_system
+    zinfo.flag_bits = info.flag_bits & 0x800  # keep only the UTF-8 name flag; sizes go in the header
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+    with zf._lock:
+        zinfo.header_offset = zf.fp.tell()
+        zf.fp.write(zinfo.FileHeader())
+        zf.fp.write(data)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+        zf._didModify = True
+
+
+def _office_pool():
+    """The office_pool module when a LibreOffice pool is running, else None"""
+    try:
+        from . import office_pool  # imported as ooxml.scripts.pack
+    except ImportError:
+        try:
+            import office_pool
+        except ImportError:
+            return None
+    return office_pool if office_pool.available() else None
+
+
 def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+    """Validate document by converting to HTML with soffice.
+
+    Uses a warm worker from office_pool.py when a pool is running, and plain
+    soffice when the pool itself can't run the conversion.
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -99,6 +356,17 @@ def validate_document(doc_path):
             filter_name = "html:HTML (StarCalc)"
 
     with tempfile.TemporaryDirectory() as temp_dir:
+        pool = _office_pool()
+        if pool is not None:
+            try:
+                pool.convert(doc_path, temp_dir, filter_name, timeout=10)
+                return True
+            except pool.OfficeJobError as e:
+                print(f"Validation error: {e}", file=sys.stderr)
+                return False
+            except pool.OfficePoolError as e:
+                print(f"Warning: LibreOffice pool unavailable ({e}), using soffice", file=sys.stderr)
+
         try:
             result = subprocess.run(
                 [
@@ -132,27 +400,134 @@ def validate_document(doc_path):
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    xml_file = Path(xml_file)
+    temp_file = xml_file.with_name(xml_file.name + ".tmp")
+    with open(temp_file, "wb") as out:
+        _condense_stream(xml_file, out)
+    os.replace(temp_file, xml_file)
+
+
+def condense_xml_bytes(xml_file):
+    """Return the condensed XML of xml_file without modifying it."""
+    buffer = io.BytesIO()
+    _condense_stream(xml_file, buffer)
+    return buffer.getvalue()
+
+
+def _condense_stream(xml_file, out):
+    """Condense xml_file into the binary stream out with a streaming SAX pass.
+
+    Memory stays constant whatever the part size. External entities and
+    entity declarations are refused by defusedxml.
+    """
+    writer = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=False)
+    handler = _CondenseHandler(writer)
+    parser = defusedxml.sax.make_parser()
+    parser.setContentHandler(handler)
+    parser.setProperty(xml.sax.handler.property_lexical_handler, handler)
+    writer.write('<?xml version="1.0" encoding="UTF-8"?>')
+    parser.parse(str(xml_file))
+    writer.flush()
+    writer.detach()
+
+
+def escape_xml(data):
+    """Escape text or an attribute value the way minidom writes it (shared with unpack.py)."""
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
+
+class _CondenseHandler(xml.sax.handler.ContentHandler):
+    """SAX handler writing the document back without whitespace-only text or comments.
+
+    Inside elements whose name ends in ":t" (w:t, a:t, ...) everything is
+    kept verbatim. Output matches minidom's toxml(): empty elements are
+    self-closed and the XML declaration carries no standalone flag.
+    """
+
+    def __init__(self, writer):
+        super().__init__()
+        self.write = writer.write
+        self.keep_text = []  # per open element: whether to keep whitespace and comments
+        self.text = []  # character data since the last markup event
+        self.start_open = False  # last start tag still lacks its closing ">"
+        self.in_cdata = False
+
+    def _close_start(self):
+        if self.start_open:
+            self.write(">")
+            self.start_open = False
+
+    def _flush_text(self):
+        if not self.text:
+            return
+        text = "".join(self.text)
+        self.text.clear()
+        # text outside the root element is never kept by a DOM either
+        if not self.keep_text or (not self.keep_text[-1] and text.strip() == ""):
+            return
+        self._close_start()
+        self.write(escape_xml(text))
+
+    def startElement(self, name, attrs):
+        self._flush_text()
+        self._close_start()
+        self.write("<" + name)
+        for attr_name, value in attrs.items():
+            self.write(f' {attr_name}="{escape_xml(value)}"')
+        self.start_open = True
+        self.keep_text.append(name.endswith(":t"))
+
+    def endElement(self, name):
+        self._flush_text()
+        if self.start_open:
+            self.write("/>")
+            self.start_open = False
+        else:
+            self.write(f"</{name}>")
+        self.keep_text.pop()
+
+    def characters(self, content):
+        if self.in_cdata:
+            self.write(content)
+        else:
+            self.text.append(content)
+
+    ignorableWhitespace = characters
+
+    def processingInstruction(self, target, data):
+        self._flush_text()
+        self._close_start()
+        self.write(f"<?{target} {data}?>")
+
+    # LexicalHandler callbacks
+
+    def comment(self, content):
+        # a comment splits text into separate nodes, so decide on the text before it
+        self._flush_text()
+        if not self.keep_text or self.keep_text[-1]:
+            self._close_start()
+            self.write(f"<!--{content}-->")
+
+    def startCDATA(self):
+        self._flush_text()
+        self._close_start()
+        self.write("<![CDATA[")
+        self.in_cdata = True
+
+    def endCDATA(self):
+        self.write("]]>")
+        self.in_cdata = False
+
+    def startDTD(self, name, public_id, system_id):
+        pass
+
+    def endDTD(self):
+        pass
 
 
 if __name__ == "__main__":
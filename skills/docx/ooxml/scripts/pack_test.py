@@ -0,0 +1,324 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import defusedxml.minidom
+
+from pack import condense_xml, condense_xml_bytes, pack_document
+from unpack import unpack_document
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# Parts of a small .docx that passes validate.py
+DOCX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Default Extension="png" ContentType="image/png"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+        "</Relationships>"
+    ),
+    "word/_rels/document.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="media/image1.png"/>'
+        "</Relationships>"
+    ),
+    "word/document.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:document xmlns:w="{W}" xmlns:r="{R}"><w:body>'
+        '<w:p><w:r><w:t xml:space="preserve">Hello </w:t></w:r><w:r><w:t>world</w:t></w:r></w:p>'
+        "<w:p><w:r><w:t>Second paragraph</w:t></w:r></w:p>"
+        "<w:sectPr/></w:body></w:document>"
+    ),
+    "word/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:styles xmlns:w="{W}">'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+        "</w:styles>"
+    ),
+    "word/media/image1.png": b"\x89PNG\r\n\x1a\n" + bytes(64),
+}
+
+
+# Pretty-printed XML exercising what condensing keeps and drops
+TRICKY_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<!-- before the root -->
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" w:attr="a &amp; b &lt; c &gt; d &quot;e&quot; \u00e9">
+  <!-- dropped -->
+  <w:body>
+    <w:p>
+      <w:r>
+        <w:t xml:space="preserve">  kept  <!-- kept inside w:t -->  spaces  </w:t>
+      </w:r>
+      <w:r>
+        <w:t>   </w:t>
+        <w:instrText> PAGE \\* MERGEFORMAT </w:instrText>
+        <w:t>caf\u00e9 &#x2013; &lt;tag&gt; &amp; "quoted"</w:t>
+      </w:r>
+      <w:empty></w:empty>
+      <w:script><![CDATA[ if (a < b && c) { } ]]></w:script>
+      <?custom instruction here?>
+      mixed <w:b/> text
+    </w:p>
+  </w:body>
+</w:document>
+<!-- after the root -->
+"""
+
+
+def condense_xml_minidom(xml_file):
+    """pack.py's previous DOM-based condensing, the reference for the streaming pass"""
+    with open(xml_file, "r", encoding="utf-8") as f:
+        dom = defusedxml.minidom.parse(f)
+
+    for element in dom.getElementsByTagName("*"):
+        if element.tagName.endswith(":t"):
+            continue
+        for child in list(element.childNodes):
+            if (
+                child.nodeType == child.TEXT_NODE
+                and child.nodeValue
+                and child.nodeValue.strip() == ""
+            ) or child.nodeType == child.COMMENT_NODE:
+                element.removeChild(child)
+
+    return dom.toxml(encoding="UTF-8")
+
+
+def make_package(path, parts=DOCX_PARTS):
+    """Write parts ({name: str or bytes}) to the Office file path"""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+    return Path(path)
+
+
+def zip_contents(path):
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+def condensed_contents(path, scratch_dir):
+    """zip_contents() with XML parts condensed.
+
+    Entries reused from the original keep its XML declaration and whitespace,
+    so XML is compared after condensing both sides.
+    """
+    contents = zip_contents(path)
+    for name, data in contents.items():
+        if name.endswith((".xml", ".rels")):
+            scratch = Path(scratch_dir) / "part.xml"
+            scratch.write_bytes(data)
+            contents[name] = condense_xml_bytes(scratch)
+    return contents
+
+
+def dir_contents(directory):
+    directory = Path(directory)
+    return {
+        f.relative_to(directory).as_posix(): f.read_bytes()
+        for f in directory.rglob("*")
+        if f.is_file()
+    }
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPackDocument(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp.name)
+        self.original = make_package(self.dir / "original.docx")
+        self.unpacked = self.dir / "unpacked"
+        unpack_document(self.original, self.unpacked)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_input_directory_is_not_modified(self):
+        """Packing condenses XML in memory and leaves the unpacked files as they were"""
+        before = dir_contents(self.unpacked)
+        self.assertTrue(pack_document(self.unpacked, self.dir / "out.docx", incremental=False))
+        self.assertEqual(dir_contents(self.unpacked), before)
+
+    def test_parts_are_condensed(self):
+        """Every part is packed, XML condensed and everything else byte for byte"""
+        output = self.dir / "out.docx"
+        pack_document(self.unpacked, output, incremental=False)
+        packed = zip_contents(output)
+        self.assertEqual(set(packed), set(DOCX_PARTS))
+        for name, data in packed.items():
+            if name.endswith((".xml", ".rels")):
+                self.assertEqual(data, condense_xml_bytes(self.unpacked / name))
+            else:
+                self.assertEqual(data, (self.unpacked / name).read_bytes())
+
+    def test_rejects_bad_arguments(self):
+        """A missing input directory or a non-Office output name is a ValueError"""
+        with self.assertRaises(ValueError):
+            pack_document(self.dir / "missing", self.dir / "out.docx")
+        with self.assertRaises(ValueError):
+            pack_document(self.unpacked, self.dir / "out.zip")
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp.name)
+        parts = dict(DOCX_PARTS)
+        paragraphs = "".join(
+            f"<w:p><w:r><w:t>Paragraph {i} of a longer document</w:t></w:r></w:p>"
+            for i in range(2000)
+        )
+        parts["word/document.xml"] = parts["word/document.xml"].replace(
+            "<w:sectPr/>", paragraphs + "<w:sectPr/>"
+        )
+        self.unpacked = self.dir / "unpacked"
+        unpack_document(make_package(self.dir / "original.docx", parts), self.unpacked)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_media_is_stored(self):
+        """Already-compressed media is stored; XML and other parts are deflated"""
+        output = self.dir / "out.docx"
+        pack_document(self.unpacked, output, incremental=False)
+        with zipfile.ZipFile(output) as zf:
+            self.assertEqual(zf.getinfo("word/media/image1.png").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.getinfo("word/document.xml").compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_compress_level(self):
+        """A higher deflate level gives the same parts in no more space"""
+        sizes = {}
+        for level in (1, 9):
+            output = self.dir / f"level{level}.docx"
+            pack_document(self.unpacked, output, incremental=False, compress_level=level)
+            with zipfile.ZipFile(output) as zf:
+                sizes[level] = zf.getinfo("word/document.xml").compress_size
+        self.assertEqual(zip_contents(self.dir / "level1.docx"), zip_contents(self.dir / "level9.docx"))
+        self.assertLess(sizes[9], sizes[1])
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestIncrementalPack(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp.name)
+        self.original = make_package(self.dir / "original.docx")
+        self.unpacked = self.dir / "unpacked"
+        unpack_document(self.original, self.unpacked)
+        document = self.unpacked / "word" / "document.xml"
+        document.write_text(document.read_text().replace("Second paragraph", "Edited"))
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def full_repack(self):
+        output = self.dir / "full.docx"
+        pack_document(self.unpacked, output, incremental=False)
+        return condensed_contents(output, self.dir)
+
+    def test_same_contents_as_full_repack(self):
+        """Reusing unchanged parts gives the same entries, in the same order, as recompressing all"""
+        output = self.dir / "incremental.docx"
+        pack_document(self.unpacked, output)
+        with zipfile.ZipFile(output) as zf:
+            self.assertIsNone(zf.testzip())
+        self.assertEqual(
+            list(condensed_contents(output, self.dir).items()), list(self.full_repack().items())
+        )
+
+    def test_unchanged_parts_are_copied_compressed(self):
+        """Unchanged parts keep the original's compressed entry; edited ones are rewritten"""
+        output = self.dir / "incremental.docx"
+        pack_document(self.unpacked, output)
+        with zipfile.ZipFile(self.original) as original, zipfile.ZipFile(output) as packed:
+            styles = original.getinfo("word/styles.xml")
+            self.assertEqual(
+                (packed.getinfo("word/styles.xml").CRC, packed.getinfo("word/styles.xml").compress_size),
+                (styles.CRC, styles.compress_size),
+            )
+            self.assertNotEqual(
+                packed.getinfo("word/document.xml").CRC, original.getinfo("word/document.xml").CRC
+            )
+
+    def test_changed_original_is_not_reused(self):
+        """Once the original file changes, its entries no longer stand for the unpacked parts"""
+        parts = dict(DOCX_PARTS)
+        parts["word/styles.xml"] = parts["word/styles.xml"].replace("Normal", "Other")
+        make_package(self.original, parts)
+        pack_document(self.unpacked, self.dir / "incremental.docx")
+        pack_document(self.unpacked, self.dir / "full.docx", incremental=False)
+        self.assertEqual(
+            zip_contents(self.dir / "incremental.docx"), zip_contents(self.dir / "full.docx")
+        )
+
+    def test_repack_over_original(self):
+        """Packing onto the original file itself works while its entries are being copied"""
+        expected = self.full_repack()
+        pack_document(self.unpacked, self.original)
+        self.assertEqual(condensed_contents(self.original, self.dir), expected)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCondenseXml(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp.name)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def assert_matches_minidom(self, xml_file):
+        self.assertEqual(condense_xml_bytes(xml_file), condense_xml_minidom(xml_file))
+
+    def test_tricky_markup_matches_minidom(self):
+        """Comments, whitespace, :t text, CDATA, PIs and escapes come out as minidom wrote them"""
+        xml_file = self.dir / "tricky.xml"
+        xml_file.write_text(TRICKY_XML, encoding="utf-8")
+        self.assert_matches_minidom(xml_file)
+
+    def test_condense_in_place(self):
+        """condense_xml() rewrites the file with what condense_xml_bytes() returns"""
+        xml_file = self.dir / "tricky.xml"
+        xml_file.write_text(TRICKY_XML, encoding="utf-8")
+        expected = condense_xml_bytes(xml_file)
+        condense_xml(xml_file)
+        self.assertEqual(xml_file.read_bytes(), expected)
+        self.assertEqual([f.name for f in self.dir.iterdir()], ["tricky.xml"])
+
+    def test_unpacked_parts_match_minidom(self):
+        """Every pretty-printed part of an unpacked document condenses as with minidom"""
+        unpack_document(make_package(self.dir / "original.docx"), self.dir / "unpacked")
+        for xml_file in (self.dir / "unpacked").rglob("*"):
+            if xml_file.name.endswith((".xml", ".rels")):
+                with self.subTest(part=xml_file.name):
+                    self.assert_matches_minidom(xml_file)
+
+    def test_condensing_leaves_file_alone(self):
+        """condense_xml_bytes() returns the result without rewriting the part"""
+        xml_file = self.dir / "tricky.xml"
+        xml_file.write_text(TRICKY_XML, encoding="utf-8")
+        condense_xml_bytes(xml_file)
+        self.assertEqual(xml_file.read_text(encoding="utf-8"), TRICKY_XML)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,29 +1,266 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--part word/document.xml] [--workers N]
+"""
+
+import argparse
+import fnmatch
+import io
+import os
 import random
-import sys
 import defusedxml.minidom
+import defusedxml.sax
+import xml.sax.handler
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+try:
+    from .pack import PARALLEL_MIN_PARTS, escape_xml, write_manifest  # imported as ooxml.scripts.unpack
+except ImportError:
+    from pack import PARALLEL_MIN_PARTS, escape_xml, write_manifest
+
+# Parts larger than this are pretty-printed by the streaming printer instead of minidom
+STREAM_PRETTY_BYTES = 4 * 1024 * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unpack an Office file and pretty-print its XML")
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--part",
+        action="append",
+        dest="parts",
+        help="Only extract this part or glob pattern, plus its .rels (repeatable)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes for pretty-printing XML (default: CPU count, 1 = serial)",
+    )
+    parser.add_argument(
+        "--stream-threshold",
+        type=int,
+        default=STREAM_PRETTY_BYTES,
+        help=f"Stream-print parts larger than this many bytes (default: {STREAM_PRETTY_BYTES})",
+    )
+    args = parser.parse_args()
+
+    suggested_rsid = unpack_document(
+        args.office_file,
+        args.output_dir,
+        parts=args.parts,
+        workers=args.workers or os.cpu_count() or 1,
+        stream_threshold=args.stream_threshold,
+    )
+    if suggested_rsid:
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(
+    input_file, output_dir, parts=None, workers=None, stream_threshold=STREAM_PRETTY_BYTES
+):
+    """Extract an Office file and pretty-print its XML parts.
+
+    A full unpack also writes the manifest pack.py uses to reuse unchanged
+    parts. Selecting parts gives a directory for inspection only: packing it
+    would produce a file without the other parts.
+
+    Args:
+        input_file: Path to the .docx/.pptx/.xlsx file
+        output_dir: Directory to extract into (created if needed)
+        parts: Part names or glob patterns to extract, e.g. ["word/document.xml"];
+            the .rels of each selected part is included (default: everything)
+        workers: Processes for pretty-printing (default: 1, serial; more need the
+            caller's entry point behind an `if __name__ == "__main__"` guard)
+        stream_threshold: Parts larger than this many bytes are printed by the
+            streaming printer, which gives the same output in constant memory
+
+    Returns:
+        str: A suggested RSID for tracked changes for .docx files, else None
+    """
+    input_file = Path(input_file)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    with zipfile.ZipFile(input_file) as zf:
+        members = None if parts is None else _select_parts(zf.namelist(), parts)
+        zf.extractall(output_path, members)
+
+    # Pretty print all XML files
+    xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
+    pretty_print = partial(pretty_print_xml, stream_threshold=stream_threshold)
+    workers = workers or 1
+    if workers > 1 and len(xml_files) >= PARALLEL_MIN_PARTS:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(xml_files) // (workers * 4))
+            list(pool.map(pretty_print, xml_files, chunksize=chunksize))
+    else:
+        for xml_file in xml_files:
+            pretty_print(xml_file)
+
+    # Hash the unpacked parts so pack.py can reuse the unchanged ones
+    if parts is None:
+        write_manifest(output_path, input_file)
+
+    # For .docx files, suggest an RSID for tracked changes
+    if input_file.suffix.lower() == ".docx":
+        return "".join(random.choices("0123456789ABCDEF", k=8))
+    return None
+
+
+def _select_parts(names, patterns):
+    """Members matching any pattern, plus the relationships part of each match"""
+    selected = {name for name in names if any(fnmatch.fnmatchcase(name, p) for p in patterns)}
+    for name in list(selected):
+        folder, _, filename = name.rpartition("/")
+        rels = f"{folder}/_rels/{filename}.rels" if folder else f"_rels/{filename}.rels"
+        if rels in names:
+            selected.add(rels)
+    return [name for name in names if name in selected]
+
+
+def pretty_print_xml(xml_file, stream_threshold=STREAM_PRETTY_BYTES):
+    """Rewrite xml_file indented by two spaces, ASCII-encoded with character references."""
+    xml_file = Path(xml_file)
+    if xml_file.stat().st_size > stream_threshold:
+        temp_file = xml_file.with_name(xml_file.name + ".tmp")
+        with open(temp_file, "wb") as out:
+            _pretty_print_stream(xml_file, out)
+        os.replace(temp_file, xml_file)
+    else:
+        content = xml_file.read_text(encoding="utf-8")
+        dom = defusedxml.minidom.parseString(content)
+        xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+
+
+def _pretty_print_stream(xml_file, out):
+    """Pretty-print xml_file into the binary stream out with a streaming SAX pass."""
+    writer = io.TextIOWrapper(out, encoding="ascii", errors="xmlcharrefreplace", newline="")
+    handler = _PrettyPrintHandler(writer)
+    parser = defusedxml.sax.make_parser()
+    parser.setContentHandler(handler)
+    parser.setProperty(xml.sax.handler.property_lexical_handler, handler)
+    writer.write('<?xml version="1.0" encoding="ascii"?>\n')
+    parser.parse(str(xml_file))
+    writer.flush()
+    writer.detach()
+
+
+class _PrettyPrintHandler(xml.sax.handler.ContentHandler):
+    """SAX handler reproducing minidom's toprettyxml(indent="  ") layout.
+
+    An element whose only child is a text or CDATA node keeps it inline, so
+    each element's first text/CDATA child is held back until the next event
+    shows whether another child follows.
+    """
+
+    INDENT = "  "
+
+    def __init__(self, writer):
+        super().__init__()
+        self.write = writer.write
+        self.open = []  # per open element: [name, has written children]
+        self.start_open = False  # last start tag still lacks its closing ">"
+        self.text = []  # character data since the last markup event
+        self.pending = None  # ("text" | "cdata", data) held back as a possible only child
+
+    def _indent(self):
+        return self.INDENT * len(self.open)
+
+    def _flush_text(self):
+        """Turn buffered character data into a child node"""
+        if not self.text:
+            return
+        data = "".join(self.text)
+        self.text.clear()
+        if self.open:  # text outside the root element is not kept
+            self._add_child("text", data)
+
+    def _add_child(self, kind, data=None):
+        """Account for a new child of the current element, writing anything held back"""
+        if not self.open:
+            return
+        frame = self.open[-1]
+        if not frame[1] and self.pending is None and kind in ("text", "cdata"):
+            self.pending = (kind, data)
+            return
+        if self.start_open:
+            self.write(">\n")
+            self.start_open = False
+        frame[1] = True
+        if self.pending is not None:
+            self._write_node(*self.pending)
+            self.pending = None
+        if kind in ("text", "cdata"):
+            self._write_node(kind, data)
+
+    def _write_node(self, kind, data):
+        if kind == "text":
+            self.write(escape_xml(f"{self._indent()}{data}\n"))
+        else:
+            self.write(f"<![CDATA[{data}]]>")
+
+    def startElement(self, name, attrs):
+        self._flush_text()
+        self._add_child("element")
+        self.write(f"{self._indent()}<{name}")
+        for attr_name, value in attrs.items():
+            self.write(f' {attr_name}="{escape_xml(value)}"')
+        self.start_open = True
+        self.open.append([name, False])
+
+    def endElement(self, name):
+        self._flush_text()
+        has_children = self.open[-1][1]
+        self.open.pop()
+        if self.pending is not None:
+            # a single text or CDATA child stays on the element's line
+            kind, data = self.pending
+            self.pending = None
+            self.write(">" + (escape_xml(data) if kind == "text" else f"<![CDATA[{data}]]>"))
+            self.write(f"</{name}>\n")
+        elif has_children:
+            self.write(f"{self._indent()}</{name}>\n")
+        else:
+            self.write("/>\n")
+        self.start_open = False
+
+    def characters(self, content):
+        self.text.append(content)
+
+    ignorableWhitespace = characters
+
+    def processingInstruction(self, target, data):
+        self._flush_text()
+        self._add_child("pi")
+        self.write(f"{self._indent()}<?{target} {data}?>\n")
+
+    # LexicalHandler callbacks
+
+    def comment(self, content):
+        self._flush_text()
+        self._add_child("comment")
+        self.write(f"{self._indent()}<!--{content}-->\n")
+
+    def startCDATA(self):
+        self._flush_text()
+
+    def endCDATA(self):
+        data = "".join(self.text)
+        self.text.clear()
+        self._add_child("cdata", data)
+
+    def startDTD(self, name, public_id, system_id):
+        pass
+
+    def endDTD(self):
+        pass
+
+
+if __name__ == "__main__":
+    main()
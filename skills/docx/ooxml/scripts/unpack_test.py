@@ -0,0 +1,66 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from pack import manifest_path
+from pack_test import DOCX_PARTS, TRICKY_XML, dir_contents, make_package
+from unpack import pretty_print_xml, unpack_document
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestUnpackDocument(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp.name)
+        self.original = make_package(self.dir / "original.docx")
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_streaming_matches_minidom(self):
+        """Parts above the stream threshold are pretty-printed exactly as minidom would"""
+        unpack_document(self.original, self.dir / "minidom")
+        unpack_document(self.original, self.dir / "streaming", stream_threshold=0)
+        self.assertEqual(dir_contents(self.dir / "streaming"), dir_contents(self.dir / "minidom"))
+
+    def test_streaming_matches_minidom_on_tricky_markup(self):
+        """Comments, mixed content, CDATA, PIs and non-ASCII text print as with minidom"""
+        for name, threshold in (("minidom.xml", 1 << 30), ("streaming.xml", 0)):
+            xml_file = self.dir / name
+            xml_file.write_text(TRICKY_XML, encoding="utf-8")
+            pretty_print_xml(xml_file, stream_threshold=threshold)
+        self.assertEqual(
+            (self.dir / "streaming.xml").read_bytes(), (self.dir / "minidom.xml").read_bytes()
+        )
+
+    def test_full_unpack_writes_manifest(self):
+        """A full unpack extracts every part and records them for incremental packing"""
+        rsid = unpack_document(self.original, self.dir / "unpacked")
+        self.assertEqual(set(dir_contents(self.dir / "unpacked")), set(DOCX_PARTS))
+        self.assertTrue(manifest_path(self.dir / "unpacked").is_file())
+        self.assertRegex(rsid, "^[0-9A-F]{8}$")
+
+    def test_selected_parts_include_their_rels(self):
+        """Selecting a part also extracts its .rels, and writes no manifest"""
+        unpack_document(self.original, self.dir / "unpacked", parts=["word/document.xml"])
+        self.assertEqual(
+            set(dir_contents(self.dir / "unpacked")),
+            {"word/document.xml", "word/_rels/document.xml.rels"},
+        )
+        self.assertFalse(manifest_path(self.dir / "unpacked").exists())
+
+    def test_importable_from_skill_root(self):
+        """unpack_document() imports as ooxml.scripts.unpack, the way document.py imports pack"""
+        skill_root = Path(__file__).resolve().parent.parent.parent
+        subprocess.run(
+            [sys.executable, "-c", "from ooxml.scripts.unpack import unpack_document"],
+            cwd=skill_root,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,11 +2,313 @@
 Base validator with common validation logic for document files.
 """
 
+import contextlib
+import copy
+import fnmatch
+import functools
+import hashlib
+import io
+import json
+import os
 import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+# Below this many files with a schema, XSD validation runs serially instead of in a process pool
+XSD_PARALLEL_MIN_FILES = 16
+
+# Compiled XSD schemas by schema path, shared by every validator in the process
+_schema_cache = {}
+# Seconds spent compiling each cached schema
+schema_compile_seconds = {}
+
+
+def load_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it on first use.
+
+    A schema that fails to compile is cached as well and re-raises its error.
+    """
+    schema_path = Path(schema_path)
+    schema = _schema_cache.get(schema_path)
+    if schema is None:
+        start = time.perf_counter()
+        try:
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(
+                    xsd_file, parser=parser, base_url=str(schema_path)
+                )
+                schema = lxml.etree.XMLSchema(xsd_doc)
+        except Exception as e:
+            schema = e
+        schema_compile_seconds[schema_path] = time.perf_counter() - start
+        _schema_cache[schema_path] = schema
+    if isinstance(schema, Exception):
+        raise schema
+    return schema
+
+
+class OriginalPackage:
+    """Parts of the original Office file, read from the zip on demand instead of extracted."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._names = set(self._zip.namelist())
+        # Baseline XSD errors per part name, filled in by the schema validators
+        self.xsd_errors = {}
+
+    def __contains__(self, part_name):
+        return part_name in self._names
+
+    def read(self, part_name):
+        """Return the bytes of part_name, e.g. "word/document.xml"."""
+        return self._zip.read(part_name)
+
+    def close(self):
+        self._zip.close()
+
+
+# Open original packages by resolved path, with the (size, mtime) they were opened at,
+# least recently used first
+_original_packages = {}
+# Packages kept open at once; older ones are closed when another is opened
+MAX_OPEN_ORIGINALS = 4
+
+
+def open_original(path):
+    """Return the shared OriginalPackage for path, reopening it if the file has changed.
+
+    It stays open until close_original(path), usually through closing the
+    validator that opened it, or until MAX_OPEN_ORIGINALS newer ones are open.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (stat.st_size, stat.st_mtime_ns)
+    cached = _original_packages.pop(path, None)
+    if cached is None or cached[0] != key:
+        if cached is not None:
+            cached[1].close()
+        cached = (key, OriginalPackage(path))
+    _original_packages[path] = cached
+    while len(_original_packages) > MAX_OPEN_ORIGINALS:
+        close_original(next(iter(_original_packages)))
+    return cached[1]
+
+
+def close_original(path):
+    """Close the shared OriginalPackage for path, if one is open."""
+    cached = _original_packages.pop(Path(path).resolve(), None)
+    if cached is not None:
+        cached[1].close()
+
+
+# Bump when validation logic changes, so older incremental manifests are ignored
+VALIDATION_MANIFEST_VERSION = 1
+
+
+def validation_manifest_path(unpacked_dir):
+    """Incremental validation manifest for unpacked_dir: a hidden file beside it."""
+    unpacked_dir = Path(unpacked_dir).resolve()
+    return unpacked_dir.with_name(f".{unpacked_dir.name}.validation.json")
+
+
+def cross_part_check(*patterns):
+    """Mark a check that reads several parts, so incremental validation can skip it.
+
+    patterns (fnmatch, matched against paths relative to unpacked_dir) select
+    the parts the check reads; it is also assumed to depend on the list of
+    files. While none of these changed since the last passing validation, the
+    check's output from that run is replayed instead of running it again.
+    """
+
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            return self._run_cross_part(method, patterns)
+
+        return wrapper
+
+    return decorate
+
+
+# The validator each XSD pool worker validates with; its schema cache is per process
+_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file):
+    global _worker_validator
+    _worker_validator = validator_class(unpacked_dir, original_file)
+
+
+def _validate_file_in_worker(xml_file):
+    return _worker_validator.validate_file_against_xsd(xml_file)
+
+
+class Rule:
+    """A per-element check run by the single-pass rule engine.
+
+    Validators list their rules in RULES. For every part a rule applies to,
+    the engine walks the parsed tree once and calls visit() for each element
+    matching the rule's interests:
+
+        tags: Clark names, e.g. "{http://...}t"
+        local_names: lowercase local names in any namespace
+        attribute_suffixes: lowercase endings of any attribute's local name
+
+    A rule without interests sees every element. Rules report by appending
+    lines to self.errors; an exception from visit() is recorded as an error
+    for the part and the rule skips the rest of that part.
+    """
+
+    tags = ()
+    local_names = ()
+    attribute_suffixes = ()
+    # Whether errors in one part depend on other parts; incremental validation
+    # only skips unchanged parts for rules that don't
+    cross_part = False
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+        self.path = None  # part being walked, relative to unpacked_dir
+
+    def applies_to(self, xml_file):
+        """Whether this rule checks xml_file at all."""
+        return True
+
+    def start_file(self, xml_file, path):
+        """Called before walking xml_file; path is relative to unpacked_dir."""
+        self.path = path
+
+    def visit(self, elem):
+        raise NotImplementedError
+
+
+def has_ancestor(elem, tag):
+    """True if elem lies inside an element with the Clark name tag."""
+    return next(elem.iterancestors(tag), None) is not None
+
+
+class _RuleDispatch:
+    """Lookup tables from element tag and attributes to the rules interested in them."""
+
+    def __init__(self, rules):
+        self.by_tag = {}
+        self.by_local = {}
+        self.by_attribute = []
+        self.every = []
+        for rule in rules:
+            if not (rule.tags or rule.local_names or rule.attribute_suffixes):
+                self.every.append(rule)
+            for tag in rule.tags:
+                self.by_tag.setdefault(tag, []).append(rule)
+            for name in rule.local_names:
+                self.by_local.setdefault(name, []).append(rule)
+            if rule.attribute_suffixes:
+                self.by_attribute.append(rule)
+
+
+def _walk_rules(root, dispatch):
+    """Dispatch every element of root to the interested rules in one pass."""
+    by_tag = dispatch.by_tag
+    by_local = dispatch.by_local
+    by_attribute = dispatch.by_attribute
+    every = dispatch.every
+
+    failed = set()
+    for elem in root.iter():
+        tag = elem.tag
+        if not isinstance(tag, str):
+            continue  # comments and processing instructions
+
+        matched = every + by_tag.get(tag, []) if by_tag else every
+        if by_local:
+            matched = matched + by_local.get(tag.rpartition("}")[2].lower(), [])
+        if by_attribute and elem.attrib:
+            # An attribute key ends with its local name, so suffixes match either
+            attributes = [attr.lower() for attr in elem.attrib]
+            matched = matched + [
+                rule
+                for rule in by_attribute
+                if any(attr.endswith(rule.attribute_suffixes) for attr in attributes)
+            ]
+        if not matched:
+            continue
+        if len(matched) > 1:
+            matched = list(dict.fromkeys(matched))
+
+        for rule in matched:
+            if rule in failed:
+                continue
+            try:
+                rule.visit(elem)
+            except Exception as e:
+                rule.errors.append(f"  {rule.path}: Error: {e}")
+                failed.add(rule)
+
+
+class UniqueIdRule(Rule):
+    """IDs listed in UNIQUE_ID_REQUIREMENTS must be unique per file or globally."""
+
+    cross_part = True
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.requirements = validator.UNIQUE_ID_REQUIREMENTS
+        self.local_names = set(self.requirements)
+        self.alternate_content = f"{{{validator.MC_NAMESPACE}}}AlternateContent"
+        self.global_ids = {}  # Track globally unique IDs across all files
+        self.file_ids = {}
+
+    def start_file(self, xml_file, path):
+        super().start_file(xml_file, path)
+        self.file_ids = {}  # Track IDs that must be unique within this file
+
+    def visit(self, elem):
+        # Elements inside mc:AlternateContent are alternatives, not duplicates
+        if has_ancestor(elem, self.alternate_content):
+            return
+
+        tag = elem.tag.split("}")[-1].lower()
+        attr_name, scope = self.requirements[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            if attr.split("}")[-1].lower() == attr_name:
+                id_value = value
+                break
+        if id_value is None:
+            return
+
+        if scope == "global":
+            # Check global uniqueness
+            if id_value in self.global_ids:
+                prev_file, prev_line, prev_tag = self.global_ids[id_value]
+                self.errors.append(
+                    f"  {self.path}: "
+                    f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
+                    f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                )
+            else:
+                self.global_ids[id_value] = (self.path, elem.sourceline, tag)
+        elif scope == "file":
+            # Check file-level uniqueness
+            ids = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in ids:
+                self.errors.append(
+                    f"  {self.path}: "
+                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {ids[id_value]})"
+                )
+            else:
+                ids[id_value] = elem.sourceline
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -37,6 +339,9 @@ class BaseSchemaValidator:
         "grpsp": ("id", "file"),  # Group shape IDs
     }
 
+    # Per-element checks run together in one pass over each part (see Rule)
+    RULES = [UniqueIdRule]
+
     # Mapping of element names to expected relationship types
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
@@ -103,10 +408,22 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        warm_schemas=False,
+        workers=None,
+        incremental=False,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        # Processes for XSD validation (default: 1, serial; the validate.py
+        # CLI uses the CPU count). A pool needs the caller's entry point
+        # behind an `if __name__ == "__main__"` guard on spawn platforms.
+        self.workers = workers or 1
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -120,6 +437,227 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees (or the parse error) per file, shared by all checks
+        self._trees = {}
+        self.parse_count = 0
+        self.parse_hits = 0
+        self.parse_seconds = 0.0
+
+        # Errors per rule class, filled by the first check that needs them
+        self._rule_errors = {}
+
+        # Files the per-part checks look at; incremental validation narrows
+        # this to the parts changed since the last passing validation
+        self.check_files = self.xml_files
+        self.incremental = incremental
+        self._previous = None  # manifest of the last passing validation
+        self._checks = {}  # cross-part check outputs for the next manifest
+        if incremental:
+            self._start_incremental()
+
+        # Compile the schemas this document needs up front instead of on first use
+        if warm_schemas:
+            self.warm_schemas()
+
+    def _relative(self, xml_file):
+        return xml_file.relative_to(self.unpacked_dir).as_posix()
+
+    def _original_signature(self):
+        stat = self.original_file.stat()
+        return [str(self.original_file.resolve()), stat.st_size, stat.st_mtime_ns]
+
+    def _start_incremental(self):
+        """Hash every part and narrow check_files to the parts changed since the last pass."""
+        self._part_hashes = {
+            self._relative(f): hashlib.sha256(f.read_bytes()).hexdigest()
+            for f in self.xml_files
+        }
+        self._listing = sorted(
+            p.relative_to(self.unpacked_dir).as_posix()
+            for p in self.unpacked_dir.rglob("*")
+            if p.is_file()
+        )
+
+        try:
+            previous = json.loads(validation_manifest_path(self.unpacked_dir).read_text())
+        except (OSError, ValueError):
+            return
+        if (
+            previous.get("version") != VALIDATION_MANIFEST_VERSION
+            or previous.get("validator") != type(self).__name__
+            or previous.get("original") != self._original_signature()
+        ):
+            return  # results from another validator or baseline don't carry over
+        self._previous = previous
+
+        def changed(name):
+            return self._part_hashes.get(name) != previous["parts"].get(name)
+
+        # A part is also re-checked when its relationships changed, since its
+        # r:id references are validated against them
+        self.check_files = []
+        for xml_file in self.xml_files:
+            name = self._relative(xml_file)
+            folder, _, filename = name.rpartition("/")
+            rels = f"{folder}/_rels/{filename}.rels" if folder else f"_rels/{filename}.rels"
+            if changed(name) or changed(rels):
+                self.check_files.append(xml_file)
+
+    def _inputs_digest(self, patterns):
+        """Hash of the file list and the content of the parts matching patterns."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([self.verbose, self._listing]).encode())
+        for name, part_hash in sorted(self._part_hashes.items()):
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                digest.update(f"{name}:{part_hash}\n".encode())
+        return digest.hexdigest()
+
+    def _run_cross_part(self, method, patterns):
+        """Run a cross-part check, or replay its passing output if its inputs are unchanged."""
+        if not self.incremental:
+            return method(self)
+
+        name = method.__name__
+        inputs = self._inputs_digest(patterns)
+        previous = self._previous["checks"].get(name) if self._previous else None
+        if previous is not None and previous["inputs"] == inputs:
+            print(previous["output"], end="")
+            self._checks[name] = previous
+            return True
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            passed = method(self)
+        print(output.getvalue(), end="")
+        self._checks[name] = {"inputs": inputs, "output": output.getvalue()}
+        return passed
+
+    def finish_incremental(self, passed):
+        """Record this run for the next incremental validation if every check passed.
+
+        A failed run leaves the previous manifest in place: parts unchanged
+        since that passing run are still known to be valid.
+        """
+        if not (self.incremental and passed):
+            return
+        manifest = {
+            "version": VALIDATION_MANIFEST_VERSION,
+            "validator": type(self).__name__,
+            "original": self._original_signature(),
+            "parts": self._part_hashes,
+            "checks": self._checks,
+        }
+        manifest_file = validation_manifest_path(self.unpacked_dir)
+        temp_file = manifest_file.with_name(manifest_file.name + ".tmp")
+        temp_file.write_text(json.dumps(manifest))
+        os.replace(temp_file, manifest_file)
+
+    def warm_schemas(self):
+        """Compile every schema needed by the XML files into the shared schema cache."""
+        schema_paths = {self._get_schema_path(f) for f in self.xml_files} - {None}
+        for schema_path in sorted(schema_paths):
+            try:
+                load_schema(schema_path)
+            except Exception:
+                pass  # reported per file by validate_against_xsd
+
+    def _parse(self, xml_file):
+        """Return the parsed tree of xml_file, parsing each file only once.
+
+        Checks share the returned tree and must not modify it; a check that
+        needs to edit a part works on a copy.deepcopy(). A parse error is
+        cached and re-raised.
+        """
+        key = Path(xml_file)
+        tree = self._trees.get(key)
+        if tree is None:
+            start = time.perf_counter()
+            try:
+                tree = lxml.etree.parse(str(key))
+            except Exception as e:
+                tree = e
+            self.parse_seconds += time.perf_counter() - start
+            self.parse_count += 1
+            self._trees[key] = tree
+        else:
+            self.parse_hits += 1
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
+    def rule_errors(self, rule_class):
+        """Return the errors found by rule_class.
+
+        The first call runs every rule in RULES (plus rule_class) in a single
+        pass over each part; later calls return the collected results.
+        """
+        if rule_class not in self._rule_errors:
+            rule_classes = [cls for cls in self.RULES if cls not in self._rule_errors]
+            if rule_class not in rule_classes:
+                rule_classes.append(rule_class)
+            rules = [cls(self) for cls in rule_classes]
+            dispatches = {}  # per combination of applicable rules
+
+            # A cross-part rule looks at every part once any part it checks
+            # changed; otherwise its last passing result still holds
+            check_files = set(self.check_files)
+            walk_all = {
+                rule
+                for rule in rules
+                if rule.cross_part and any(rule.applies_to(f) for f in check_files)
+            }
+            for xml_file in self.xml_files:
+                active = tuple(
+                    rule
+                    for rule in rules
+                    if (rule in walk_all or xml_file in check_files)
+                    and rule.applies_to(xml_file)
+                )
+                if not active:
+                    continue
+                path = xml_file.relative_to(self.unpacked_dir)
+                for rule in active:
+                    rule.start_file(xml_file, path)
+                try:
+                    root = self._parse(xml_file).getroot()
+                except Exception as e:
+                    for rule in active:
+                        rule.errors.append(f"  {path}: Error: {e}")
+                    continue
+                if active not in dispatches:
+                    dispatches[active] = _RuleDispatch(active)
+                _walk_rules(root, dispatches[active])
+
+            for rule in rules:
+                self._rule_errors[type(rule)] = rule.errors
+        return self._rule_errors[rule_class]
+
+    def print_timing_stats(self):
+        """Print time spent parsing files and compiling schemas."""
+        print(
+            f"Parsed {self.parse_count} files in {self.parse_seconds:.2f}s "
+            f"({self.parse_hits} reused by later checks)"
+        )
+        if self._previous is not None:
+            print(
+                f"Reused results for {len(self.xml_files) - len(self.check_files)} "
+                f"unchanged parts, checked {len(self.check_files)}"
+            )
+        print(
+            f"Compiled {len(schema_compile_seconds)} schemas in "
+            f"{sum(schema_compile_seconds.values()):.2f}s (cached for this process)"
+        )
+
+    def close(self):
+        """Close the original package this validator read, so the file isn't held open."""
+        close_original(self.original_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
@@ -128,10 +666,10 @@ class BaseSchemaValidator:
         """Validate that all XML files are well-formed."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self.check_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -157,9 +695,9 @@ class BaseSchemaValidator:
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self.check_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -185,84 +723,7 @@ class BaseSchemaValidator:
 
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
-        errors = []
-        global_ids = {}  # Track globally unique IDs across all files
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
-
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self.rule_errors(UniqueIdRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -274,6 +735,7 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    @cross_part_check("*.rels")
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
@@ -310,7 +772,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -390,12 +852,10 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
+        for xml_file in self.check_files:
             # Skip .rels files themselves
             if xml_file.suffix == ".rels":
                 continue
@@ -411,7 +871,7 @@ class BaseSchemaValidator:
 
             try:
                 # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
                 rid_to_type = {}
 
                 for rel in rels_root.findall(
@@ -434,7 +894,7 @@ class BaseSchemaValidator:
                         rid_to_type[rid] = type_name
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
@@ -519,6 +979,7 @@ class BaseSchemaValidator:
 
         return None
 
+    @cross_part_check("*")
     def validate_content_types(self):
         """Validate that all content files are properly declared in [Content_Types].xml."""
         errors = []
@@ -531,7 +992,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -593,7 +1054,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -692,12 +1153,7 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
-            relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
-
+        for relative_path, is_valid, new_file_errors in self._xsd_results():
             if is_valid is None:
                 skipped_count += 1
                 continue
@@ -712,7 +1168,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +1194,43 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _xsd_results(self):
+        """Return (relative_path, is_valid, new_errors) for every XML file, sorted by path.
+
+        Files with a schema are validated in a process pool when there are
+        enough of them; each worker compiles and caches its own schemas.
+        Parts outside check_files passed in the last validation and count
+        as valid.
+        """
+        files = sorted(
+            self.xml_files, key=lambda f: str(f.relative_to(self.unpacked_dir))
+        )
+        with_schema = [f for f in files if self._get_schema_path(f) is not None]
+        check_files = set(self.check_files)
+        checked = [f for f in with_schema if f in check_files]
+
+        workers = self.workers
+        if workers > 1 and len(checked) >= XSD_PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_xsd_worker,
+                initargs=(type(self), self.unpacked_dir, self.original_file),
+            ) as pool:
+                chunksize = max(1, len(checked) // (workers * 4))
+                results = pool.map(
+                    _validate_file_in_worker, checked, chunksize=chunksize
+                )
+                outcomes = dict(zip(checked, results))
+        else:
+            outcomes = {f: self.validate_file_against_xsd(f) for f in checked}
+        for f in with_schema:
+            outcomes.setdefault(f, (True, set()))
+
+        return [
+            (str(f.relative_to(self.unpacked_dir)), *outcomes.get(f, (None, set())))
+            for f in files
+        ]
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -765,8 +1258,7 @@ class BaseSchemaValidator:
     def _clean_ignorable_namespaces(self, xml_doc):
         """Remove attributes and elements not in allowed namespaces."""
         # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
+        xml_copy = copy.deepcopy(xml_doc.getroot())
 
         # Remove attributes not in allowed namespaces
         for elem in xml_copy.iter():
@@ -823,24 +1315,27 @@ class BaseSchemaValidator:
 
         return xml_doc
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
-        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
+    def _validate_single_file_xsd(self, xml_file, base_path, xml_bytes=None):
+        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set).
+
+        xml_bytes, if given, is validated in place of the file's content.
+        """
         schema_path = self._get_schema_path(xml_file)
         if not schema_path:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
-
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            # Load schema (compiled once per process)
+            schema = load_schema(schema_path)
+
+            # Load and preprocess XML (the preprocessing below works on copies)
+            if xml_bytes is not None:
+                xml_doc = lxml.etree.ElementTree(lxml.etree.fromstring(xml_bytes))
+            elif base_path == self.unpacked_dir:
+                xml_doc = self._parse(xml_file)
+            else:
+                with open(xml_file, "r") as f:
+                    xml_doc = lxml.etree.parse(f)
 
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
@@ -869,39 +1364,34 @@ class BaseSchemaValidator:
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The part is read straight from the original zip and its errors are
+        memoized, so each part of the original is validated at most once.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
-        relative_path = xml_file.relative_to(unpacked_dir)
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+        part_name = xml_file.relative_to(unpacked_dir).as_posix()
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
+        original = open_original(self.original_file)
+        errors = original.xsd_errors.get(part_name)
+        if errors is None:
+            if part_name not in original:
                 # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+                errors = set()
+            else:
+                # Validate the original bytes under the same name, so the same schema applies
+                is_valid, errors = self._validate_single_file_xsd(
+                    xml_file, unpacked_dir, xml_bytes=original.read(part_name)
+                )
+                errors = errors if errors else set()
+            original.xsd_errors[part_name] = errors
+        return errors
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -917,8 +1407,7 @@ class BaseSchemaValidator:
         template_pattern = re.compile(r"\{\{[^}]*\}\}")
 
         # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
+        xml_copy = copy.deepcopy(xml_doc.getroot())
 
         def process_text_content(text, content_type):
             if not text:
@@ -842,9 +842,10 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
+        # Create validators with current state; schema validation only
+        # re-checks parts changed since the last passing validation
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path, self.original_docx, verbose=False, incremental=True
         )
         redlining_validator = RedliningValidator(
             self.unpacked_path, self.original_docx, verbose=False
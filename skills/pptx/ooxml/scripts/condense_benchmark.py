@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming condense_xml_bytes in pack.py against the previous minidom implementation.
+
+Generates pretty-printed WordprocessingML parts of increasing size (as unpack.py
+would leave them), condenses each with both implementations in a fresh process,
+checks that the outputs are identical and reports time and peak memory.
+
+Example usage:
+    python condense_benchmark.py [--sizes 1 4 16] [--skip-minidom-above 64]
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import defusedxml.minidom
+
+from pack import condense_xml_bytes
+
+PARAGRAPH = """    <w:p w14:paraId="{id:08X}" w:rsidR="00A1B2C3">
+      <w:pPr>
+        <w:pStyle w:val="Normal"/>
+      </w:pPr>
+      <!-- paragraph {id} -->
+      <w:r>
+        <w:rPr>
+          <w:b/>
+        </w:rPr>
+        <w:t xml:space="preserve">Paragraph {id}: </w:t>
+      </w:r>
+      <w:r>
+        <w:t>The quick brown fox jumps over the lazy dog &amp; keeps running.</w:t>
+      </w:r>
+    </w:p>
+"""
+
+
+def condense_xml_minidom(xml_file):
+    """The previous DOM-based condense_xml, returning bytes instead of rewriting the file."""
+    with open(xml_file, "r", encoding="utf-8") as f:
+        dom = defusedxml.minidom.parse(f)
+
+    for element in dom.getElementsByTagName("*"):
+        if element.tagName.endswith(":t"):
+            continue
+        for child in list(element.childNodes):
+            if (
+                child.nodeType == child.TEXT_NODE
+                and child.nodeValue
+                and child.nodeValue.strip() == ""
+            ) or child.nodeType == child.COMMENT_NODE:
+                element.removeChild(child)
+
+    return dom.toxml(encoding="UTF-8")
+
+
+IMPLEMENTATIONS = {
+    "streaming": condense_xml_bytes,
+    "minidom": condense_xml_minidom,
+}
+
+
+def write_document(path, megabytes):
+    """Write a pretty-printed document.xml of roughly the given size."""
+    target = megabytes * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+        f.write(
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+            ' xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml">\n'
+            "  <w:body>\n"
+        )
+        paragraph_id = 0
+        while f.tell() < target:
+            f.write(PARAGRAPH.format(id=paragraph_id))
+            paragraph_id += 1
+        f.write("  </w:body>\n</w:document>\n")
+
+
+def _measure(name, xml_file):
+    """Run one implementation; executed in a fresh worker process."""
+    start = time.perf_counter()
+    data = IMPLEMENTATIONS[name](xml_file)
+    seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return seconds, peak_kb, data
+
+
+def measure(name, xml_file):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(_measure, name, xml_file).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark condense_xml implementations")
+    parser.add_argument(
+        "--sizes",
+        type=float,
+        nargs="+",
+        default=[1, 4, 16],
+        help="Part sizes in MB (default: 1 4 16)",
+    )
+    parser.add_argument(
+        "--skip-minidom-above",
+        type=float,
+        default=64,
+        help="Skip the minidom run for parts larger than this many MB (default: 64)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'size':>8}  {'implementation':<14}  {'seconds':>8}  {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for megabytes in args.sizes:
+            xml_file = Path(temp_dir) / "document.xml"
+            write_document(xml_file, megabytes)
+
+            outputs = {}
+            for name in IMPLEMENTATIONS:
+                if name == "minidom" and megabytes > args.skip_minidom_above:
+                    continue
+                seconds, peak_kb, outputs[name] = measure(name, xml_file)
+                print(
+                    f"{megabytes:>6g}MB  {name:<14}  {seconds:>8.2f}  {peak_kb / 1024:>8.0f}MB"
+                )
+
+            if len(set(outputs.values())) > 1:
+                print("Outputs differ between implementations", file=sys.stderr)
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import office_pool
+import pack
+
+# Stand-in for soffice: listens on the --accept port and tells each client its UserInstallation
+FAKE_SOFFICE = """#!{python}
+import re, socket, sys
+args = " ".join(sys.argv)
+port = int(re.search(r"port=(\\d+)", args).group(1))
+profile = re.search(r"-env:UserInstallation=(\\S+)", args).group(1)
+server = socket.socket()
+server.bind(("127.0.0.1", port))
+server.listen()
+while True:
+    client, _ = server.accept()
+    client.sendall(profile.encode() + b"\\n")
+    client.close()
+"""
+
+# Stand-in for the Python-UNO bridge, talking to FAKE_SOFFICE
+FAKE_UNO = """import re, socket
+from pathlib import Path
+
+
+def systemPathToFileUrl(path):
+    return Path(path).as_uri()
+
+
+class Document:
+    def __init__(self, url):
+        self.url = url
+
+    def supportsService(self, name):
+        return False
+
+    def storeToURL(self, url, properties):
+        Path(url[len("file://"):]).write_text(properties[0].Value)
+
+    def close(self, deliver):
+        pass
+
+
+class Desktop:
+    def loadComponentFromURL(self, url, frame, flags, properties):
+        return Document(url)
+
+
+class PathSubstitution:
+    def __init__(self, profile):
+        self.profile = profile
+
+    def getSubstituteVariableValue(self, name):
+        return self.profile + "/user"
+
+
+class Resolver:
+    def resolve(self, url):
+        port = int(re.search(r"port=(\\d+)", url).group(1))
+        with socket.create_connection(("127.0.0.1", port), timeout=2) as connection:
+            return Context(connection.makefile().readline().strip())
+
+
+class ServiceManager:
+    def __init__(self, profile):
+        self.profile = profile
+
+    def createInstanceWithContext(self, name, context):
+        if name.endswith("UnoUrlResolver"):
+            return Resolver()
+        if name.endswith("PathSubstitution"):
+            return PathSubstitution(self.profile)
+        return Desktop()
+
+
+class Context:
+    def __init__(self, profile=None):
+        self.ServiceManager = ServiceManager(profile)
+
+
+def getComponentContext():
+    return Context()
+"""
+
+
+def install_fakes(directory):
+    """Put a stand-in soffice on PATH and stand-in uno/com.sun.star modules on sys.path"""
+    soffice = directory / "soffice"
+    soffice.write_text(FAKE_SOFFICE.format(python=sys.executable))
+    soffice.chmod(0o755)
+    (directory / "uno.py").write_text(FAKE_UNO)
+    beans = directory / "com" / "sun" / "star" / "beans"
+    beans.mkdir(parents=True)
+    for package in (beans.parent.parent.parent, beans.parent.parent, beans.parent):
+        (package / "__init__.py").write_text("")
+    (beans / "__init__.py").write_text("class PropertyValue:\n    pass\n")
+    os.environ["PATH"] = f"{directory}{os.pathsep}{os.environ['PATH']}"
+    sys.path.insert(0, str(directory))
+
+
+def wait_for_exit(pid):
+    for _ in range(50):
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return
+        time.sleep(0.05)
+
+
+class FakeOfficeTestCase(unittest.TestCase):
+    """Runs each test against a fresh pool directory, with the stand-in soffice and uno"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fakes = tempfile.TemporaryDirectory()
+        cls.saved_path = os.environ["PATH"]
+        install_fakes(Path(cls.fakes.name))
+
+    @classmethod
+    def tearDownClass(cls):
+        os.environ["PATH"] = cls.saved_path
+        sys.path.remove(cls.fakes.name)
+        cls.fakes.cleanup()
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.saved_pool_dir = os.environ.get("OFFICE_POOL_DIR")
+        os.environ["OFFICE_POOL_DIR"] = str(Path(self.temp.name) / "pool")
+
+    def tearDown(self):
+        office_pool.stop()
+        if self.saved_pool_dir is None:
+            del os.environ["OFFICE_POOL_DIR"]
+        else:
+            os.environ["OFFICE_POOL_DIR"] = self.saved_pool_dir
+        self.temp.cleanup()
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+@unittest.skipIf(office_pool.fcntl is None, "the pool needs POSIX file locking")
+class TestOfficePool(FakeOfficeTestCase):
+
+    def test_lock_is_exclusive(self):
+        """A worker locked by one holder can't be acquired by another until released"""
+        first = office_pool.OfficeWorker(0)
+        second = office_pool.OfficeWorker(0)
+        self.assertTrue(first.try_acquire())
+        self.assertFalse(second.try_acquire())
+        first.release()
+        self.assertTrue(second.try_acquire())
+        second.release()
+
+    def test_busy_pool_is_not_a_job_error(self):
+        """A busy pool gives up after the job timeout with a pool error, not a failed job"""
+        office_pool.start(1)
+        worker = office_pool.OfficeWorker(0)
+        self.assertTrue(worker.try_acquire())
+        started = time.monotonic()
+        try:
+            with self.assertRaises(office_pool.OfficePoolError) as raised:
+                office_pool.run_job(lambda desktop: None, timeout=0.5)
+        finally:
+            worker.release()
+        self.assertNotIsInstance(raised.exception, office_pool.OfficeJobError)
+        self.assertLess(time.monotonic() - started, 5)  # not ACQUIRE_TIMEOUT
+
+    def test_restart_after_crash(self):
+        """A job on a worker whose soffice died restarts it first"""
+        office_pool.start(1)
+        worker = office_pool.OfficeWorker(0)
+        old_pid = worker.pid()
+        os.killpg(old_pid, signal.SIGKILL)
+        wait_for_exit(old_pid)
+        self.assertFalse(worker.is_running())
+
+        self.assertEqual(office_pool.run_job(lambda desktop: "done", timeout=5), "done")
+        self.assertNotEqual(worker.pid(), old_pid)
+        self.assertTrue(worker.is_running())
+
+    def test_restart_after_timeout(self):
+        """A job over its timeout fails as a job and leaves a fresh worker behind"""
+        office_pool.start(1)
+        worker = office_pool.OfficeWorker(0)
+        old_pid = worker.pid()
+        with self.assertRaises(office_pool.OfficeJobError):
+            office_pool.run_job(lambda desktop: time.sleep(2), timeout=0.2)
+        self.assertNotEqual(worker.pid(), old_pid)
+        self.assertTrue(worker.is_running())
+
+    def test_failed_job_keeps_worker(self):
+        """An exception in the job is a job error; the healthy worker is kept"""
+        office_pool.start(1)
+        worker = office_pool.OfficeWorker(0)
+        old_pid = worker.pid()
+
+        def job(desktop):
+            raise RuntimeError("cannot load")
+
+        with self.assertRaises(office_pool.OfficeJobError):
+            office_pool.run_job(job, timeout=5)
+        self.assertEqual(worker.pid(), old_pid)
+
+    def test_foreign_listener_is_not_running(self):
+        """A worker whose port is served by another pool's soffice is restarted, not used"""
+        other = office_pool.OfficeWorker(0, Path(self.temp.name) / "other")
+        other.start()
+        try:
+            office_pool.start(1)
+            worker = office_pool.OfficeWorker(0)
+            self.assertNotEqual(worker.port, other.port)
+
+            state = json.loads(worker.state_file.read_text())
+            state["port"] = other.port
+            worker.state_file.write_text(json.dumps(state))
+            self.assertFalse(worker.is_running())
+
+            office_pool.run_job(lambda desktop: None, timeout=5)
+            self.assertNotEqual(worker.port, other.port)
+            self.assertTrue(worker.is_running())
+        finally:
+            other.stop()
+
+    def test_stale_pid_is_not_killed(self):
+        """Stopping a worker whose state names an unrelated process only discards the state"""
+        worker = office_pool.OfficeWorker(0)
+        worker.dir.mkdir(parents=True)
+        unrelated = subprocess.Popen(["sleep", "30"], start_new_session=True)
+        try:
+            worker.state_file.write_text(json.dumps({"pid": unrelated.pid, "port": 1}))
+            worker.stop()
+            self.assertIsNone(unrelated.poll())
+            self.assertFalse(worker.state_file.exists())
+        finally:
+            unrelated.kill()
+            unrelated.wait()
+
+    def test_shared_pool_dir_is_refused(self):
+        """A pool directory other users can access is neither used nor started in"""
+        root = office_pool.pool_dir()
+        root.mkdir(mode=0o755)
+        root.chmod(0o755)
+        (root / "pool.json").write_text(json.dumps({"workers": 1}))
+        try:
+            self.assertFalse(office_pool.available())
+            with self.assertRaises(office_pool.OfficePoolError):
+                office_pool.start(1)
+            self.assertFalse((root / "worker-0").exists())
+        finally:
+            root.chmod(0o700)
+
+    def test_convert(self):
+        """convert() stores the document through the worker and returns the output path"""
+        office_pool.start(1)
+        source = Path(self.temp.name) / "deck.pptx"
+        source.write_bytes(b"")
+        output = office_pool.convert(source, self.temp.name, "html:impress_html_Export")
+        self.assertEqual(output, Path(self.temp.name).resolve() / "deck.html")
+        self.assertEqual(output.read_text(), "impress_html_Export")
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+@unittest.skipIf(office_pool.fcntl is None, "the pool needs POSIX file locking")
+class TestValidateDocumentWithPool(FakeOfficeTestCase):
+
+    def test_pool_failure_falls_back_to_soffice(self):
+        """A pool that can't start soffice doesn't make the document invalid"""
+        office_pool.start(1)
+        office_pool.OfficeWorker(0).stop()
+        saved_path = os.environ["PATH"]
+        os.environ["PATH"] = self.temp.name  # neither the pool nor the fallback finds soffice
+        try:
+            document = Path(self.temp.name) / "doc.docx"
+            document.write_bytes(b"")
+            self.assertTrue(pack.validate_document(document))
+        finally:
+            os.environ["PATH"] = saved_path
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,20 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--workers N] [--incremental]
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
 
 
 def main():
@@ -24,6 +30,16 @@ def main():
         required=True,
         help="Path to original file (.docx/.pptx/.xlsx)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes for XSD validation (default: CPU count, 1 = serial)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-check parts changed since the last passing run (keeps a manifest beside the directory)",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -55,9 +71,19 @@ def main():
     # Run validators
     success = True
     for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+        if issubclass(V, BaseSchemaValidator):
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                workers=args.workers or os.cpu_count() or 1,
+                incremental=args.incremental,
+            )
+        else:
+            validator = V(unpacked_dir, original_file, verbose=args.verbose)
+        with validator:
+            if not validator.validate():
+                success = False
 
     if success:
         print("All validations PASSED!")
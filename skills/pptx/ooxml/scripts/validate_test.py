@@ -0,0 +1,285 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pack_test import DOCX_PARTS, make_package
+from unpack import unpack_document
+from validation import DOCXSchemaValidator, base
+
+
+def run_validator(validator):
+    """Run validator.validate(); returns (passed, printed output)"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        passed = validator.validate()
+    return passed, output.getvalue()
+
+
+class UnpackedDocxTestCase(unittest.TestCase):
+    """Each test gets a freshly unpacked copy of pack_test's small .docx"""
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp.name)
+        self.original = make_package(self.dir / "original.docx")
+        self.unpacked = self.dir / "unpacked"
+        unpack_document(self.original, self.unpacked)
+        self.document = self.unpacked / "word" / "document.xml"
+
+    def tearDown(self):
+        base.close_original(self.original)
+        self.temp.cleanup()
+
+    def edit_document(self, old, new):
+        text = self.document.read_text()
+        self.assertIn(old, text)
+        self.document.write_text(text.replace(old, new))
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestDocxValidation(UnpackedDocxTestCase):
+
+    def test_unedited_document_passes(self):
+        """A freshly unpacked document passes every check"""
+        passed, output = run_validator(DOCXSchemaValidator(self.unpacked, self.original))
+        self.assertTrue(passed, output)
+
+    def test_each_part_parsed_once(self):
+        """Checks share one parsed tree per part"""
+        validator = DOCXSchemaValidator(self.unpacked, self.original)
+        run_validator(validator)
+        self.assertLessEqual(validator.parse_count, len(validator.xml_files))
+        self.assertGreater(validator.parse_hits, 0)
+
+    def test_malformed_part_fails(self):
+        """A part that is not well-formed is reported and stops validation"""
+        self.edit_document("</w:body>", "</w:bod>")
+        passed, output = run_validator(DOCXSchemaValidator(self.unpacked, self.original))
+        self.assertFalse(passed)
+        self.assertIn("document.xml", output)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestSchemaCache(UnpackedDocxTestCase):
+
+    def test_schema_compiled_once(self):
+        """Validators in one process share each compiled schema"""
+        validator = DOCXSchemaValidator(self.unpacked, self.original)
+        schema_path = validator._get_schema_path(self.document)
+        self.assertIs(base.load_schema(schema_path), base.load_schema(schema_path))
+
+    def test_compile_failure_is_cached(self):
+        """A schema that fails to compile raises on every use without recompiling"""
+        broken = self.dir / "broken.xsd"
+        broken.write_text(
+            '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"><xs:bogus/></xs:schema>'
+        )
+        with self.assertRaises(Exception) as first:
+            base.load_schema(broken)
+        with self.assertRaises(Exception) as second:
+            base.load_schema(broken)
+        self.assertIs(first.exception, second.exception)
+
+    def test_new_schema_error_fails(self):
+        """An element the schema doesn't allow is a new XSD error"""
+        self.edit_document("<w:sectPr/>", "<w:bogus/><w:sectPr/>")
+        passed, output = run_validator(DOCXSchemaValidator(self.unpacked, self.original))
+        self.assertFalse(passed)
+        self.assertIn("bogus", output)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestOriginalPackage(UnpackedDocxTestCase):
+
+    def test_parts_read_from_zip(self):
+        """Original parts are read from the package without extracting it"""
+        package = base.open_original(self.original)
+        self.assertIn("word/document.xml", package)
+        self.assertNotIn("word/missing.xml", package)
+        self.assertEqual(package.read("word/styles.xml"), DOCX_PARTS["word/styles.xml"].encode())
+
+    def test_reopened_when_changed(self):
+        """The shared package is reused until the original file changes"""
+        package = base.open_original(self.original)
+        self.assertIs(base.open_original(self.original), package)
+
+        parts = dict(DOCX_PARTS)
+        parts["word/styles.xml"] = parts["word/styles.xml"].replace("Normal", "Changed")
+        make_package(self.original, parts)
+        reopened = base.open_original(self.original)
+        self.assertIsNot(reopened, package)
+        self.assertIn(b"Changed", reopened.read("word/styles.xml"))
+
+    def test_closed_with_validator(self):
+        """Closing the validator (or leaving its with block) closes the original's zip"""
+        with DOCXSchemaValidator(self.unpacked, self.original) as validator:
+            run_validator(validator)
+            package = base.open_original(self.original)
+        self.assertNotIn(self.original.resolve(), base._original_packages)
+        self.assertIsNone(package._zip.fp)
+
+    def test_open_packages_bounded(self):
+        """Opening more than MAX_OPEN_ORIGINALS packages closes the least recently used"""
+        paths = [
+            make_package(self.dir / f"copy{i}.docx") for i in range(base.MAX_OPEN_ORIGINALS + 1)
+        ]
+        packages = [base.open_original(path) for path in paths]
+        try:
+            self.assertEqual(len(base._original_packages), base.MAX_OPEN_ORIGINALS)
+            self.assertIsNone(packages[0]._zip.fp)
+            self.assertIsNotNone(packages[-1]._zip.fp)
+        finally:
+            for path in paths:
+                base.close_original(path)
+
+    def test_paragraphs_compared_with_original(self):
+        """The paragraph count of the original comes from the package"""
+        self.edit_document("<w:sectPr/>", "<w:p/><w:sectPr/>")
+        passed, output = run_validator(DOCXSchemaValidator(self.unpacked, self.original))
+        self.assertTrue(passed, output)
+        self.assertIn("Paragraphs: 2 → 3 (+1)", output)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestParallelXsd(UnpackedDocxTestCase):
+
+    def test_serial_by_default(self):
+        """Library callers get no process pool unless they ask for workers"""
+        self.assertEqual(DOCXSchemaValidator(self.unpacked, self.original).workers, 1)
+
+    def test_pool_matches_serial(self):
+        """A process pool reports the same results, in the same order, as a serial run"""
+        self.edit_document("<w:sectPr/>", "<w:bogus/><w:sectPr/>")
+        saved_min_files = base.XSD_PARALLEL_MIN_FILES
+        base.XSD_PARALLEL_MIN_FILES = 1
+        try:
+            serial = run_validator(DOCXSchemaValidator(self.unpacked, self.original, workers=1))
+            pooled = run_validator(DOCXSchemaValidator(self.unpacked, self.original, workers=2))
+        finally:
+            base.XSD_PARALLEL_MIN_FILES = saved_min_files
+        self.assertFalse(serial[0])
+        self.assertEqual(pooled, serial)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRules(UnpackedDocxTestCase):
+
+    REVISION = 'w:id="9" w:author="Reviewer" w:date="2024-01-01T00:00:00Z"'
+
+    def assert_fails_with(self, message):
+        passed, output = run_validator(DOCXSchemaValidator(self.unpacked, self.original))
+        self.assertFalse(passed)
+        self.assertIn(message, output)
+
+    def test_whitespace_needs_preserve(self):
+        """w:t text with trailing whitespace needs xml:space='preserve'"""
+        self.edit_document("<w:t>world</w:t>", "<w:t>world </w:t>")
+        self.assert_fails_with("w:t element with whitespace missing xml:space='preserve': 'world '")
+
+    def test_text_inside_deletion(self):
+        """Deleted runs must use w:delText, not w:t"""
+        self.edit_document(
+            "<w:sectPr/>",
+            f"<w:p><w:del {self.REVISION}><w:r><w:t>gone</w:t></w:r></w:del></w:p><w:sectPr/>",
+        )
+        self.assert_fails_with("<w:t> found within <w:del>: 'gone'")
+
+    def test_deleted_text_inside_insertion(self):
+        """w:delText inside an insertion that isn't also deleted is an error"""
+        self.edit_document(
+            "<w:sectPr/>",
+            f"<w:p><w:ins {self.REVISION}><w:r><w:delText>odd</w:delText></w:r></w:ins></w:p>"
+            "<w:sectPr/>",
+        )
+        self.assert_fails_with("<w:delText> within <w:ins>: 'odd'")
+
+    def test_duplicate_bookmark_ids(self):
+        """Bookmark IDs must be unique within a part"""
+        self.edit_document(
+            "<w:sectPr/>",
+            '<w:p><w:bookmarkStart w:id="1" w:name="a"/><w:bookmarkStart w:id="1" w:name="b"/></w:p>'
+            "<w:sectPr/>",
+        )
+        self.assert_fails_with("Duplicate id='1' in <bookmarkstart>")
+
+    def test_rules_share_one_pass(self):
+        """A single walk over the parts collects the errors of every rule"""
+        self.edit_document("<w:t>world</w:t>", "<w:t>world </w:t>")
+        validator = DOCXSchemaValidator(self.unpacked, self.original)
+        run_validator(validator)
+        self.assertEqual(set(validator._rule_errors), set(validator.RULES))
+        self.assertEqual(validator.parse_count, len(validator.xml_files))
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestIncrementalValidation(UnpackedDocxTestCase):
+
+    def validator(self):
+        return DOCXSchemaValidator(self.unpacked, self.original, incremental=True)
+
+    def setUp(self):
+        super().setUp()
+        passed, output = run_validator(self.validator())
+        self.assertTrue(passed, output)
+        self.manifest = base.validation_manifest_path(self.unpacked)
+
+    def tearDown(self):
+        self.manifest.unlink(missing_ok=True)
+        super().tearDown()
+
+    def test_manifest_written_after_pass(self):
+        self.assertTrue(self.manifest.is_file())
+        self.assertEqual(self.validator().check_files, [])
+
+    def test_edited_part_rechecked(self):
+        """Only the edited part goes through the per-part checks again"""
+        self.edit_document("<w:t>world</w:t>", "<w:t>everyone</w:t>")
+        validator = self.validator()
+        self.assertEqual(validator.check_files, [self.document])
+        passed, output = run_validator(validator)
+        self.assertTrue(passed, output)
+
+    def test_error_in_edited_part_caught(self):
+        """An error in the edited part fails, and keeps failing until it is fixed"""
+        self.edit_document("<w:t>world</w:t>", "<w:t>world </w:t>")
+        for _ in range(2):
+            passed, output = run_validator(self.validator())
+            self.assertFalse(passed)
+            self.assertIn("missing xml:space='preserve'", output)
+
+    def test_cross_part_check_replayed(self):
+        """A cross-part check whose inputs are unchanged replays its recorded output"""
+        # File references only read the .rels parts, which the edit leaves alone
+        manifest = json.loads(self.manifest.read_text())
+        manifest["checks"]["validate_file_references"]["output"] = "REPLAYED\n"
+        self.manifest.write_text(json.dumps(manifest))
+        self.edit_document("<w:t>world</w:t>", "<w:t>everyone</w:t>")
+        passed, output = run_validator(self.validator())
+        self.assertTrue(passed, output)
+        self.assertIn("REPLAYED", output)
+
+    def test_cross_part_check_rerun_when_files_change(self):
+        """Adding a file reruns the cross-part checks, which catch the unreferenced part"""
+        manifest = json.loads(self.manifest.read_text())
+        manifest["checks"]["validate_file_references"]["output"] = "REPLAYED\n"
+        self.manifest.write_text(json.dumps(manifest))
+        (self.unpacked / "word" / "media" / "image2.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+        passed, output = run_validator(self.validator())
+        self.assertFalse(passed)
+        self.assertNotIn("REPLAYED", output)
+        self.assertIn("image2.png", output)
+
+    def test_changed_original_checks_everything(self):
+        """A manifest recorded against another original is ignored"""
+        parts = dict(DOCX_PARTS)
+        parts["word/styles.xml"] = parts["word/styles.xml"].replace("Normal", "Changed")
+        make_package(self.original, parts)
+        validator = self.validator()
+        self.assertEqual(validator.check_files, validator.xml_files)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,19 +3,91 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
 
 import lxml.etree
 
-from .base import BaseSchemaValidator
+from .base import (
+    BaseSchemaValidator,
+    Rule,
+    UniqueIdRule,
+    has_ancestor,
+    open_original,
+)
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+W_T = f"{{{WORD_2006_NAMESPACE}}}t"
+W_DEL = f"{{{WORD_2006_NAMESPACE}}}del"
+W_INS = f"{{{WORD_2006_NAMESPACE}}}ins"
+W_DEL_TEXT = f"{{{WORD_2006_NAMESPACE}}}delText"
+
+
+def _text_preview(text):
+    """repr() of text, cut to 50 characters."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class DocumentRule(Rule):
+    """A rule that only checks document.xml files."""
+
+    def applies_to(self, xml_file):
+        return xml_file.name == "document.xml"
+
+
+class WhitespacePreservationRule(DocumentRule):
+    """w:t elements with leading or trailing whitespace need xml:space='preserve'."""
+
+    tags = (W_T,)
+
+    def visit(self, elem):
+        text = elem.text
+        if not text:
+            return
+        # Check if text starts or ends with whitespace
+        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
+            # Check if xml:space="preserve" attribute exists
+            if elem.get(f"{{{XML_NAMESPACE}}}space") != "preserve":
+                self.errors.append(
+                    f"  {self.path}: "
+                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}"
+                )
+
+
+class DeletionRule(DocumentRule):
+    """Deleted text must use w:delText, so no w:t with text may sit inside a w:del."""
+
+    tags = (W_T,)
+
+    def visit(self, elem):
+        if elem.text and has_ancestor(elem, W_DEL):
+            self.errors.append(
+                f"  {self.path}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_text_preview(elem.text)}"
+            )
+
+
+class InsertionRule(DocumentRule):
+    """w:delText may only appear inside a w:ins when nested within a w:del."""
+
+    tags = (W_DEL_TEXT,)
+
+    def visit(self, elem):
+        if has_ancestor(elem, W_INS) and not has_ancestor(elem, W_DEL):
+            self.errors.append(
+                f"  {self.path}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_text_preview(elem.text or '')}"
+            )
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
     """Validator for Word document XML files against XSD schemas."""
 
     # Word-specific namespace
-    WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    WORD_2006_NAMESPACE = WORD_2006_NAMESPACE
+
+    # Per-element checks, run together in one pass over each document.xml
+    RULES = [UniqueIdRule, WhitespacePreservationRule, DeletionRule, InsertionRule]
 
     # Word-specific element to relationship type mappings
     # Start with empty mapping - add specific cases as we discover them
@@ -67,49 +139,17 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         # Count and compare paragraphs
         self.compare_paragraph_counts()
 
+        if self.verbose:
+            self.print_timing_stats()
+
+        self.finish_incremental(all_valid)
         return all_valid
 
     def validate_whitespace_preservation(self):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self.rule_errors(WhitespacePreservationRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
@@ -126,39 +166,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:t elements are not within w:del elements.
         For some reason, XSD validation does not catch this, so we do it manually.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self.rule_errors(DeletionRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} deletion validation violations:")
@@ -180,7 +188,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 # Count all w:p elements
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
                 count = len(paragraphs)
@@ -194,19 +202,13 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Parse document.xml straight from the original docx
+            original = open_original(self.original_file)
+            root = lxml.etree.fromstring(original.read("word/document.xml"))
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -218,37 +220,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:delText elements are not within w:ins elements.
         w:delText is only allowed in w:ins if nested within a w:del.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self.rule_errors(InsertionRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} insertion validation violations:")
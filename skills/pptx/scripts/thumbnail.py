@@ -50,6 +50,13 @@ from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 
+# office_pool.py lives with the OOXML scripts of this skill
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ooxml" / "scripts"))
+try:
+    import office_pool
+except ImportError:
+    office_pool = None
+
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
@@ -214,22 +221,34 @@ def convert_to_images(pptx_path, temp_dir, dpi):
 
     pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
 
-    # Convert to PDF
+    # Convert to PDF, on a warm LibreOffice worker when a pool is running
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
+    converted = False
+    if office_pool is not None and office_pool.available():
+        try:
+            office_pool.convert(pptx_path, temp_dir, "pdf")
+            converted = True
+        except office_pool.OfficeJobError as e:
+            raise RuntimeError(f"PDF conversion failed: {e}")
+        except office_pool.OfficePoolError as e:
+            print(f"Warning: LibreOffice pool unavailable ({e}), using soffice", file=sys.stderr)
+    if not converted:
+        result = subprocess.run(
+            [
+                "soffice",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(temp_dir),
+                str(pptx_path),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("PDF conversion failed")
+    if not pdf_path.exists():
         raise RuntimeError("PDF conversion failed")
 
     # Convert PDF to images
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Pool of warm headless LibreOffice instances shared by conversion and validation scripts.
+
+Each worker is a soffice process with an isolated UserInstallation profile,
+listening on a free localhost UNO port picked when it starts, so concurrent
+jobs never fight over one profile and pools of different users never share a
+port. A worker only counts as running when the soffice on its port reports
+the worker's own profile. Workers outlive the process that started them: any script on the
+machine borrows an idle worker through a per-worker lock file, restarts it if
+it has crashed, and kills and restarts it when a job exceeds its timeout.
+Pool state lives in a per-user directory that is only used while it is private
+(owned by the user, mode 0700).
+
+pack.py (validation), pptx thumbnail.py (PDF export) and xlsx recalc.py use the
+pool automatically while it is running and spawn soffice per call otherwise.
+Like the rest of ooxml/, this module is copied into each skill that uses it
+(docx and pptx ooxml/scripts, xlsx); keep the copies identical.
+Jobs run through LibreOffice's Python-UNO bridge, so the `uno` module must be
+importable (e.g. the python3-uno package, or LibreOffice's bundled Python).
+
+Example usage:
+    python office_pool.py start [--workers 2]
+    python office_pool.py status
+    python office_pool.py stop
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no pool, callers fall back to plain soffice
+    fcntl = None
+
+START_TIMEOUT = 60  # seconds for a fresh soffice to accept UNO connections
+ACQUIRE_TIMEOUT = 300  # max seconds to wait for an idle worker, also capped by the job timeout
+
+# Export filters for --convert-to style targets without an explicit filter
+PDF_FILTERS = {
+    "com.sun.star.text.TextDocument": "writer_pdf_Export",
+    "com.sun.star.presentation.PresentationDocument": "impress_pdf_Export",
+    "com.sun.star.sheet.SpreadsheetDocument": "calc_pdf_Export",
+}
+
+
+class OfficePoolError(Exception):
+    """A pool job failed or no worker could be started"""
+
+
+class OfficeJobError(OfficePoolError):
+    """The job itself failed or timed out on a working LibreOffice worker.
+
+    Other OfficePoolErrors mean the pool could not run the job at all
+    (soffice missing, worker failed to start, no idle worker).
+    """
+
+
+def pool_dir():
+    """Per-user pool state directory, overridable with OFFICE_POOL_DIR.
+
+    Defaults to office-pool in $XDG_RUNTIME_DIR, else office-pool-<uid> in the
+    temp directory.
+    """
+    path = os.environ.get("OFFICE_POOL_DIR")
+    if path:
+        return Path(path)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "office-pool"
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return Path(tempfile.gettempdir()) / f"office-pool-{uid}"
+
+
+def _private_pool_dir(create=False):
+    """pool_dir(), refused unless it is a directory only the current user can access.
+
+    The state and profiles in it decide which pids get killed and which profile
+    soffice runs with, so a directory planted by another user must not be used.
+    """
+    root = pool_dir()
+    if create:
+        root.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return root
+    info = os.lstat(root)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) & 0o077
+    ):
+        raise OfficePoolError(f"{root} must be a directory owned by you with mode 0700")
+    return root
+
+
+def available():
+    """True when a pool has been started and this interpreter can talk UNO to it"""
+    if fcntl is None:
+        return False
+    try:
+        if not (_private_pool_dir() / "pool.json").is_file():
+            return False
+    except (OSError, OfficePoolError):
+        return False
+    try:
+        import uno  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _free_port():
+    """A localhost port nobody listens on right now, picked by the OS"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _command_line(pid):
+    """Command line of a running process, or None if it can't be read"""
+    try:
+        return Path(f"/proc/{pid}/cmdline").read_bytes().replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        pass
+    try:  # no /proc, e.g. macOS
+        return subprocess.run(
+            ["ps", "-ww", "-o", "command=", "-p", str(pid)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class OfficeWorker:
+    """One soffice process with its own profile, port and lock file."""
+
+    def __init__(self, index, root=None):
+        self.index = index
+        self.dir = (root or pool_dir()) / f"worker-{index}"
+        self.profile = self.dir / "profile"
+        self.profile_url = self.profile.resolve().as_uri()
+        self.state_file = self.dir / "state.json"
+        self._lock_file = None
+
+    # Locking: one job per worker across all processes
+
+    def try_acquire(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.dir / "lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def release(self):
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    # Process management
+
+    def _state(self):
+        """{"pid", "port"} of the soffice last started for this worker, or None"""
+        try:
+            state = json.loads(self.state_file.read_text())
+            return {"pid": int(state["pid"]), "port": int(state["port"])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def pid(self):
+        state = self._state()
+        return None if state is None else state["pid"]
+
+    @property
+    def port(self):
+        state = self._state()
+        return None if state is None else state["port"]
+
+    def is_running(self):
+        """True when this worker's soffice is alive and is what answers on its port"""
+        state = self._state()
+        if state is None:
+            return False
+        try:
+            os.kill(state["pid"], 0)
+        except OSError:
+            return False
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            if sock.connect_ex(("127.0.0.1", state["port"])) != 0:
+                return False
+        try:
+            self._context(state["port"])
+        except Exception:
+            return False  # UNO not ready yet, or the port belongs to another process
+        return True
+
+    def start(self):
+        """Launch soffice for this worker and wait until it accepts connections"""
+        soffice = shutil.which("soffice")
+        if soffice is None:
+            raise OfficePoolError("soffice not found")
+        self.profile.mkdir(parents=True, exist_ok=True)
+        port = _free_port()
+        process = subprocess.Popen(
+            [
+                soffice,
+                "--headless",
+                "--invisible",
+                "--nocrashreport",
+                "--nodefault",
+                "--nologo",
+                "--nofirststartwizard",
+                "--norestore",
+                f"-env:UserInstallation={self.profile_url}",
+                f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self.state_file.write_text(json.dumps({"pid": process.pid, "port": port}))
+
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise OfficePoolError(f"soffice worker {self.index} exited during startup")
+            if self.is_running():
+                return
+            time.sleep(0.2)
+        self.stop()
+        raise OfficePoolError(f"soffice worker {self.index} did not start within {START_TIMEOUT}s")
+
+    def _owns(self, pid):
+        """True when pid leads the process group of soffice running with this worker's profile.
+
+        A stale state file (after a crash or reboot) may name a pid that now
+        belongs to an unrelated process, which must never be signalled.
+        """
+        try:
+            if os.getpgid(pid) != pid:
+                return False
+        except OSError:
+            return False
+        command_line = _command_line(pid)
+        return (
+            command_line is not None
+            and "soffice" in command_line
+            and f"-env:UserInstallation={self.profile_url}" in command_line
+        )
+
+    def stop(self):
+        """Kill this worker's soffice, if it is still ours, and forget its state"""
+        pid = self.pid()
+        if pid is not None and self._owns(pid):
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        try:
+            self.state_file.unlink()
+        except OSError:
+            pass
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    # Jobs
+
+    def _context(self, port):
+        """UNO component context of the soffice on port, checked to be this worker's"""
+        import uno
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local
+        )
+        context = resolver.resolve(
+            f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        )
+        # $(user) is the "user" folder inside the instance's UserInstallation
+        user = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.util.PathSubstitution", context
+        ).getSubstituteVariableValue("$(user)")
+        if not user.startswith(self.profile_url + "/"):
+            raise OfficePoolError(f"Port {port} is not served by worker {self.index}")
+        return context
+
+    def _desktop(self):
+        port = self.port
+        if port is None:
+            raise OfficePoolError(f"soffice worker {self.index} is not running")
+        context = self._context(port)
+        return context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def run(self, job, timeout):
+        """Run job(desktop) on this worker; kill and restart the worker on timeout or crash"""
+        if not self.is_running():
+            self.restart()
+        try:
+            desktop = self._desktop()
+        except Exception as e:
+            raise OfficePoolError(f"Cannot connect to worker {self.index}: {e}") from e
+
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = job(desktop)
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            self.restart()
+            raise OfficeJobError(f"Timed out after {timeout}s")
+        if "error" in outcome:
+            if not self.is_running():
+                self.restart()  # the job took soffice down with it
+            raise OfficeJobError(str(outcome["error"])) from outcome["error"]
+        return outcome.get("result")
+
+
+def _workers():
+    root = _private_pool_dir()
+    count = json.loads((root / "pool.json").read_text())["workers"]
+    return [OfficeWorker(i, root) for i in range(count)]
+
+
+def run_job(job, timeout):
+    """Run job(desktop) on the first idle worker, waiting for one if all are busy.
+
+    The wait is capped by the job's own timeout, after which the caller gets an
+    OfficePoolError and can run soffice itself instead.
+    """
+    workers = _workers()
+    deadline = time.monotonic() + min(ACQUIRE_TIMEOUT, timeout)
+    while True:
+        for worker in workers:
+            if worker.try_acquire():
+                try:
+                    return worker.run(job, timeout)
+                finally:
+                    worker.release()
+        if time.monotonic() > deadline:
+            raise OfficePoolError("No idle LibreOffice worker")
+        time.sleep(0.05)
+
+
+def _properties(**values):
+    from com.sun.star.beans import PropertyValue
+
+    properties = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+def _load(desktop, path):
+    import uno
+
+    document = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(str(Path(path).resolve())), "_blank", 0, _properties(Hidden=True)
+    )
+    if document is None:
+        raise OfficeJobError(f"Could not load {path}")
+    return document
+
+
+def convert(input_path, output_dir, convert_to, timeout=60):
+    """Convert like `soffice --convert-to <convert_to> --outdir <output_dir>`.
+
+    convert_to is "<extension>[:<filter name>]", e.g. "pdf" or
+    "html:impress_html_Export". Returns the path of the converted file.
+    """
+    import uno
+
+    extension, _, filter_name = convert_to.partition(":")
+    output_path = Path(output_dir).resolve() / f"{Path(input_path).stem}.{extension}"
+
+    def job(desktop):
+        document = _load(desktop, input_path)
+        try:
+            name = filter_name
+            if not name and extension == "pdf":
+                name = next(
+                    (f for service, f in PDF_FILTERS.items() if document.supportsService(service)),
+                    "writer_pdf_Export",
+                )
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(output_path)), _properties(FilterName=name)
+            )
+        finally:
+            document.close(True)
+
+    run_job(job, timeout)
+    if not output_path.exists():
+        raise OfficeJobError(f"Conversion of {input_path} produced no {extension} file")
+    return output_path
+
+
+def recalculate(path, timeout=30):
+    """Recalculate every formula of a spreadsheet and save it in place"""
+
+    def job(desktop):
+        document = _load(desktop, path)
+        try:
+            document.calculateAll()
+            document.store()
+        finally:
+            document.close(True)
+
+    run_job(job, timeout)
+
+
+def start(workers=2):
+    """Start (or top up) the pool; returns the number of running workers"""
+    if fcntl is None:
+        raise OfficePoolError("The LibreOffice pool needs POSIX file locking")
+    try:
+        import uno  # noqa: F401
+    except ImportError:
+        raise OfficePoolError("The LibreOffice pool needs the Python-UNO bridge (uno module)")
+    root = _private_pool_dir(create=True)
+    (root / "pool.json").write_text(json.dumps({"workers": workers}))
+    try:
+        for worker in _workers():
+            if worker.try_acquire():
+                try:
+                    if not worker.is_running():
+                        worker.restart()
+                finally:
+                    worker.release()
+    except OfficePoolError:
+        stop()  # don't leave a pool behind that callers would try to use
+        raise
+    return workers
+
+
+def stop():
+    """Stop every worker and remove the pool state"""
+    root = pool_dir()
+    if not (root / "pool.json").is_file():
+        return
+    for worker in _workers():
+        worker.stop()
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def status():
+    if not (pool_dir() / "pool.json").is_file():
+        return []
+    return [(worker.index, worker.port, worker.is_running()) for worker in _workers()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the shared LibreOffice worker pool")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("--workers", type=int, default=2, help="Workers to run (default: 2)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "start":
+            start(args.workers)
+            print(f"Started {args.workers} LibreOffice worker(s) in {pool_dir()}")
+        elif args.command == "stop":
+            stop()
+            print("Stopped LibreOffice pool")
+        else:
+            workers = status()
+            if not workers:
+                print("LibreOffice pool is not running")
+            for index, port, running in workers:
+                print(f"worker {index}: port {port}, {'running' if running else 'stopped'}")
+    except OfficePoolError as e:
+        sys.exit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,11 @@ import platform
 from pathlib import Path
 from openpyxl import load_workbook
 
+try:
+    import office_pool
+except ImportError:
+    office_pool = None
+
 
 def setup_libreoffice_macro():
     """Setup LibreOffice macro for recalculation if not already configured"""
@@ -66,6 +71,17 @@ def recalc(filename, timeout=30):
     
     abs_path = str(Path(filename).absolute())
     
+    # A running office_pool.py pool recalculates on a warm worker, no macro needed
+    if office_pool is not None and office_pool.available():
+        try:
+            office_pool.recalculate(abs_path, timeout)
+        except office_pool.OfficeJobError as e:
+            return {'error': str(e)}
+        except office_pool.OfficePoolError as e:
+            print(f'Warning: LibreOffice pool unavailable ({e}), using soffice', file=sys.stderr)
+        else:
+            return _scan_workbook(filename)
+    
     if not setup_libreoffice_macro():
         return {'error': 'Failed to setup LibreOffice macro'}
     
@@ -98,6 +114,11 @@ def recalc(filename, timeout=30):
         else:
             return {'error': error_msg}
     
+    return _scan_workbook(filename)
+
+
+def _scan_workbook(filename):
+    """Report Excel errors and the formula count of a recalculated workbook"""
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
         wb = load_workbook(filename, data_only=True)